@@ -0,0 +1,251 @@
+# Monty Hall Simulator - Library API
+#######################################
+# Author: Dave Auld
+# Version: 1.0
+# Date: 18th October 2026
+# Description: Importable entry point
+# for running simulations from other
+# programs. simulate() has no side
+# effects on import and keeps no global
+# state, so it can be called repeatedly
+# and from several threads at once.
+# The command line scripts are thin
+# wrappers around it.
+#
+# License: MIT
+#######################################
+
+import os                                   # used to check for a round log to resume
+import sys                                  # used for the unlimited round count in sequential mode
+from timeit import default_timer as timer   # used for timing the runs.
+from montyhallsim_core import defaultDoors, defaultConfidence, newSeed, blocks, checkDoors, zScore, wilsonInterval, runSequential, sequentialBlockSize
+from montyhallsim_engines import engines, streamKind, engineBlockSize  # the simulation engines by name
+from montyhallsim_roundlog import createLog, finishLog  # binary round log
+from montyhallsim_bitpack import checkPackable  # byte per round history
+from montyhallsim_store import ResultStore  # on disk store of seeded results
+from montyhallsim_checkpoint import RunProgress, SimulationInterrupted, readCheckpoint, defaultInterval  # checkpoints and interrupts
+from montyhallsim_output import outputOrders  # orders of the round output
+from montyhallsim_trace import ConvergenceTrace, TraceSchedule  # convergence trace
+from montyhallsim_tune import autoTune      # auto tuning of the engine, workers and block size
+
+class SimulationResult:
+    # Result of a simulation. results holds the win counts for each strategy, [stick, random, swap].
+    # history holds every round packed into a byte, see montyhallsim_bitpack, when it was asked for.
+    # storedRounds is the number of rounds whose counts came from the result store rather than being played.
+
+    def __init__(self, engine, rounds, results, duration, seed, doors, reveals, workers, blockSize, confidence, history=None, storedRounds=0):
+        self.engine = engine
+        self.rounds = rounds
+        self.results = results
+        self.duration = duration
+        self.seed = seed
+        self.doors = doors
+        self.reveals = reveals
+        self.workers = workers
+        self.blockSize = blockSize
+        self.confidence = confidence
+        self.history = history
+        self.storedRounds = storedRounds
+
+    @property
+    def rates(self):
+        # Win rate for each strategy, [stick, random, swap]
+        return [float(wins) / self.rounds for wins in self.results]
+
+    def intervals(self, confidence=None):
+        # Confidence interval of each strategy's win rate, [(low, high), ...]
+        z = zScore(confidence or self.confidence)
+        return [wilsonInterval(wins, self.rounds, z) for wins in self.results]
+
+    def asDict(self):
+        # Plain dictionary of the result, for JSON
+        return {
+            "engine": self.engine,
+            "rounds": self.rounds,
+            "results": list(self.results),
+            "rates": self.rates,
+            "duration": self.duration,
+            "seed": self.seed,
+            "doors": self.doors,
+            "reveals": self.reveals,
+            "workers": self.workers,
+            "blockSize": self.blockSize,
+            "storedRounds": self.storedRounds,
+        }
+
+    def __repr__(self):
+        return ("SimulationResult(engine=" + repr(self.engine) + ", rounds=" + str(self.rounds) + ", results=" + str(self.results)
+                + ", duration=" + str(self.duration) + ", seed=" + str(self.seed) + ")")
+
+def checkSettings(engine, rounds, doors, reveals, seed, precision, confidence, logPath, history=False, blockSize=None, workers=None):
+    # Check simulate() settings, raises ValueError for any that are not valid.
+    # Returns [Rounds, Reveals, Seed] with the defaults filled in.
+    if engine not in engines and engine != "auto":
+        raise ValueError("unknown engine " + repr(engine) + ", expected one of " + ", ".join(sorted(engines)) + " or auto")
+    if reveals is None:
+        reveals = doors - 2
+    checkDoors(doors, reveals)
+    if history:
+        checkPackable(doors, reveals)
+    if rounds is None:
+        if not precision:
+            raise ValueError("rounds can only be unlimited in precision mode")
+        if logPath:
+            raise ValueError("a round log needs rounds as the upper limit in precision mode")
+        if history:
+            raise ValueError("a round history needs rounds as the upper limit in precision mode")
+        rounds = sys.maxsize
+    if rounds < 1:
+        raise ValueError("the number of rounds must be at least 1")
+    if blockSize is not None and blockSize < 1:
+        raise ValueError("the block size must be at least 1")
+    if workers is not None and workers != "auto" and workers < 1:
+        raise ValueError("the number of workers must be at least 1")
+    if precision is not None and precision <= 0:
+        raise ValueError("the precision must be greater than 0")
+    if confidence <= 0 or confidence >= 1:
+        raise ValueError("the confidence level must be between 0 and 1")
+    if seed is None:
+        seed = newSeed()
+    elif seed < 0:
+        raise ValueError("the seed must be a non-negative integer")
+    return rounds, reveals, seed
+
+def simulate(rounds=1000, engine="single", workers=None, seed=None, doors=defaultDoors, reveals=None, blockSize=None,
+             precision=None, confidence=defaultConfidence, output=None, logPath=None, history=False,
+             storePath=None, checkpointPath=None, resume=False, checkpointInterval=defaultInterval, metrics=None,
+             address=None, outputOrder="completed", tracePath=None, traceStride=None):
+    # Run a simulation and return a SimulationResult.
+    #   rounds      Number of rounds. With precision set it is the upper limit, None for no limit.
+    #   engine      Engine name, one of montyhallsim_engines.engines, or "auto" to pick the engine, workers and
+    #               block size that play the rounds fastest on this machine, see montyhallsim_tune.
+    #   workers     Threads or processes, defaults to the CPU logical cores. Ignored by single thread engines.
+    #               "auto" picks the workers and block size for the engine, see montyhallsim_tune.
+    #   seed        Master random seed, a new one is drawn when None.
+    #   doors       Number of boxes, reveals the number the host opens, defaults to doors less 2.
+    #   blockSize   Rounds per random stream block, defaults to the engine's block size, at most
+    #               montyhallsim_core.defaultBlockSize in precision mode.
+    #   precision   Turns on the sequential mode, stop once every win rate is within +/- precision.
+    #   confidence  Confidence level of the intervals.
+    #   output      Called with (round, workerName) for each round played.
+    #   logPath     Write every round to this binary round log.
+    #   history     Keep every round in memory, one byte per round, as result.history. 3 boxes only.
+    #   storePath   Result store database. A run it already holds is answered from it, a longer run carries
+    #               on from the stored counts, and the counts of the run are saved to it. Runs that output,
+    #               log or keep every round play them all, but still save their counts.
+    #   checkpointPath  Save the finished blocks and their counts to this file every checkpointInterval seconds,
+    #               resume carries on from it, playing only the blocks that are left.
+    #   metrics     montyhallsim_metrics.Metrics to report the progress of the run to while it plays.
+    #   address     (Host, Port) the distributed engine listens on for workers. With workers set it also
+    #               starts that many workers on this machine.
+    #   outputOrder "completed" passes the rounds to output as the engine's workers finish them, "round" in round
+    #               number order. The single thread engines always output in round number order.
+    #   tracePath   Stream the running win rates and their variance to this CSV or JSON lines file as the run
+    #               plays, at 100, 1000, 10000 ... rounds, or every traceStride rounds when it is set.
+    # Ctrl-C raises SimulationInterrupted, a KeyboardInterrupt holding the result of the blocks finished so far.
+    rounds, reveals, seed = checkSettings(engine, rounds, doors, reveals, seed, precision, confidence, logPath, history,
+                                          blockSize, workers)
+    blockSupplied = bool(blockSize)
+    if engine == "auto" or workers == "auto":
+        tuning = autoTune(rounds, None if engine == "auto" else engine, None if workers == "auto" else workers, blockSize,
+                          bool(output or logPath or history), bool(tracePath))
+        engine, workers, blockSize = tuning.engine, tuning.workers, tuning.blockSize
+    engineClass = engines[engine]
+    blockSize = blockSize or engineBlockSize(engine)
+    if precision and not blockSupplied:
+        blockSize = sequentialBlockSize(blockSize)
+    if storePath and precision:
+        raise ValueError("a result store can not be used in precision mode")
+    if address and engine != "distributed":
+        raise ValueError("an address is only used by the distributed engine")
+    if outputOrder not in outputOrders:
+        raise ValueError("unknown output order " + repr(outputOrder) + ", expected one of " + ", ".join(outputOrders))
+    if tracePath and not getattr(engineClass, "traces", False):
+        raise ValueError("a convergence trace needs the single, threaded or multiproc engine")
+    if tracePath and (storePath or checkpointPath):
+        raise ValueError("a convergence trace plays every round from the first, it can not be used with a result store or checkpoint")
+    schedule = TraceSchedule(traceStride) if tracePath else None
+    if resume and not checkpointPath:
+        raise ValueError("resume needs a checkpoint")
+    if checkpointPath and (precision or storePath or history):
+        raise ValueError("a checkpoint can not be used in precision mode, with a result store or with a round history")
+
+    progress = RunProgress({"kind": streamKind(engine), "seed": seed, "rounds": rounds, "doors": doors, "reveals": reveals, "blockSize": blockSize},
+                           checkpointPath, checkpointInterval)
+    if resume:
+        progress.restore(readCheckpoint(checkpointPath))
+
+    # count of wins for each strategy, stick, random, swap
+    results = list(progress.results)
+
+    if logPath and not (resume and os.path.exists(logPath)):
+        createLog(logPath, rounds, doors)
+
+    # Packed rounds, each block fills its own slice
+    roundHistory = bytearray(rounds) if history else None
+
+    # Timestamp for start
+    startTime = timer()
+
+    store = ResultStore(storePath) if storePath else None
+    trace = ConvergenceTrace(tracePath, schedule) if tracePath else None
+    storeKey = (streamKind(engine), seed, doors, reveals, blockSize)
+    storedRounds = 0
+    player = None
+    try:
+        if store and not (output or logPath or history):
+            stored = store.lookup(storeKey, rounds)
+            if stored:
+                return SimulationResult(engine, rounds, stored, timer() - startTime, seed, doors, reveals, 0, blockSize, confidence,
+                                        storedRounds=rounds)
+            storedRounds, results = store.base(storeKey, rounds)
+            progress.start(storedRounds, results, storedRounds // blockSize)
+
+        engineOptions = {"address": address} if address else {}
+        if output and getattr(engineClass, "concurrentOutput", False):
+            engineOptions["outputOrder"] = outputOrder
+        if trace:
+            engineOptions["trace"] = trace
+        player = engineClass(seed, doors, reveals, workers, output, logPath, roundHistory, metrics, **engineOptions)
+        playBlocks = lambda blockList, results: player.playBlocks(blockList, results, progress.blockDone)
+        if metrics:
+            metrics.start()
+        try:
+            if precision:
+                # Sequential mode plays batches of blocks until the intervals are narrow enough
+                rounds = runSequential(playBlocks, results, rounds, blockSize, precision, zScore(confidence))
+            elif store:
+                # The whole blocks are saved on their own, so a longer run can carry on from them
+                wholeRounds = rounds - rounds % blockSize
+                playBlocks(blocks(wholeRounds, blockSize, storedRounds // blockSize), results)
+                if wholeRounds > storedRounds:
+                    store.save(storeKey, wholeRounds, results)
+                if wholeRounds < rounds:
+                    playBlocks(blocks(rounds, blockSize, wholeRounds // blockSize), results)
+                    store.save(storeKey, rounds, results)
+            else:
+                playBlocks(progress.pendingBlocks(rounds, blockSize), results)
+        finally:
+            player.close()
+            if metrics:
+                metrics.stop()
+    except KeyboardInterrupt:
+        # Report the blocks finished so far, and save them for a resume
+        progress.save()
+        partial = SimulationResult(engine, progress.rounds, list(progress.results), timer() - startTime, seed, doors, reveals,
+                                   player.workers if player else 0, blockSize, confidence, storedRounds=storedRounds)
+        raise SimulationInterrupted(partial) from None
+    finally:
+        if store:
+            store.close()
+        if trace:
+            trace.finish()
+    duration = timer() - startTime
+    progress.save()
+
+    if logPath:
+        finishLog(logPath, rounds)
+    if roundHistory is not None:
+        del roundHistory[rounds:]           # Sequential mode may stop before the upper limit
+
+    return SimulationResult(engine, rounds, results, duration, seed, doors, reveals, player.workers, blockSize, confidence, roundHistory, storedRounds)
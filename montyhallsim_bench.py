@@ -0,0 +1,173 @@
+# Monty Hall Simulator - Benchmark
+#######################################
+# Author: Dave Auld
+# Version: 1.0
+# Date: 18th October 2026
+# Description: Benchmark and scaling
+# suite. Runs each engine script over a
+# grid of round and worker counts, and
+# records rounds/sec, parallel
+# efficiency, peak RSS and startup time
+# as JSON. A run can be compared with a
+# stored baseline to flag regressions.
+#
+# License: MIT
+#######################################
+
+import argparse                             # argparse added to support command line parameter functionality
+import json                                 # used for the machine readable results
+import multiprocessing                      # Required to get CPU max logical cores.
+import os                                   # used to wait on the engine process for its resource usage
+import platform                             # used to describe the machine in the results
+import re                                   # used to read the engine output
+import subprocess                           # used to run the engines
+import sys                                  # used to run the engines with this interpreter
+from timeit import default_timer as timer   # used for timing the runs.
+
+# Engines, [Script, Worker Option, Extra Options...]. Engines without a worker option are only run with 1 worker.
+engines = {
+    "single": ["montyhallsim.py", None],
+    "threaded": ["montyhallsim_threaded.py", "-t"],
+    "multiproc": ["montyhallsim_multiproc.py", "-p"],
+    "numpy": ["montyhallsim_numpy.py", None],
+    "numpy-threaded": ["montyhallsim_threaded.py", "-t", "-n"],
+    "distributed": ["montyhallsim_distributed.py", "-w", "-L", "127.0.0.1:0"],
+    "aggregate": ["montyhallsim_numpy.py", None, "-a"],
+    "jit": ["montyhallsim_multiproc.py", "-p", "-j"],
+}
+
+# Seed used for every run, so each engine plays the same rounds on every benchmark
+benchmarkSeed = 1
+
+def runEngine(engine, rounds, workers):
+    # Run an engine once, returns [Duration, Wall Time, Peak RSS in KB]. Duration is the
+    # simulation time the engine reports, Wall Time includes interpreter startup.
+    script, workerOption = engines[engine][:2]
+    command = [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), script),
+               "-r", str(rounds), "-s", str(benchmarkSeed)] + engines[engine][2:]
+    if workerOption:
+        command += [workerOption, str(workers)]
+
+    startTime = timer()
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, universal_newlines=True)
+    output = process.stdout.read()
+    process.stdout.close()
+    returnCode, rss = waitForEngine(process)
+    wallTime = timer() - startTime
+    if returnCode != 0:
+        raise RuntimeError(engine + " failed, " + output.strip())
+
+    duration = float(re.search(r"Duration, ([0-9.eE+-]+) seconds", output).group(1))
+    return [duration, wallTime, rss]
+
+def waitForEngine(process):
+    # Wait for the engine to finish, returns [Return Code, Peak RSS in KB]. The peak RSS
+    # comes from wait4, and covers the engine and any pool processes it waited for.
+    if not hasattr(os, "wait4"):
+        return [process.wait(), None]
+    pid, status, usage = os.wait4(process.pid, 0)
+    process.returncode = os.waitstatus_to_exitcode(status)
+    maxRss = usage.ru_maxrss
+    if sys.platform == "darwin":
+        maxRss //= 1024                     # macOS reports bytes, Linux reports KB
+    return [process.returncode, maxRss]
+
+def benchmark(engineNames, roundCounts, workerCounts, repeat):
+    # Run the grid, keeping the best of repeat runs for each point
+    results = []
+    for engine in engineNames:
+        # Startup time, the wall time of a 1 round run less its simulation time
+        duration, wallTime, rss = runEngine(engine, 1, 1)
+        startup = wallTime - duration
+
+        for rounds in roundCounts:
+            baseRate = None
+            for workers in (workerCounts if engines[engine][1] else [1]):
+                best = None
+                for attempt in range(repeat):
+                    run = runEngine(engine, rounds, workers)
+                    if best is None or run[0] < best[0]:
+                        best = run
+                duration, wallTime, rss = best
+                rate = rounds / duration if duration > 0 else float("inf")
+                # Parallel efficiency is measured against the per worker rate of the smallest worker count
+                if baseRate is None:
+                    baseRate = rate * 1.0 / workers
+                result = {
+                    "engine": engine,
+                    "rounds": rounds,
+                    "workers": workers,
+                    "duration": duration,
+                    "wallTime": wallTime,
+                    "roundsPerSecond": rate,
+                    "efficiency": rate / (workers * baseRate),
+                    "peakRssKB": rss,
+                    "startup": startup,
+                }
+                results.append(result)
+                print(engine.ljust(10) + " rounds " + str(rounds).rjust(11) + "  workers " + str(workers).rjust(3)
+                      + "  " + str(int(rate)).rjust(12) + " rounds/sec  efficiency " + str(round(result["efficiency"], 2))
+                      + "  rss " + str(rss) + " KB  startup " + str(round(startup, 3)) + " s")
+    return results
+
+def compare(results, baseline, tolerance):
+    # Compare with a baseline run, returns the points where rounds/sec dropped by more than tolerance
+    previous = {}
+    for result in baseline["results"]:
+        previous[(result["engine"], result["rounds"], result["workers"])] = result
+    regressions = []
+    for result in results:
+        old = previous.get((result["engine"], result["rounds"], result["workers"]))
+        if old is None:
+            continue
+        change = result["roundsPerSecond"] / old["roundsPerSecond"] - 1
+        if change < -tolerance:
+            regressions.append([result["engine"], result["rounds"], result["workers"], change])
+    return regressions
+
+def machine():
+    # Description of the machine the benchmark ran on
+    return {
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "python": platform.python_version(),
+        "cpuCount": multiprocessing.cpu_count(),
+    }
+
+if __name__ == "__main__":
+
+    # Defaults
+    roundCounts = [10000, 100000, 1000000]
+    workerCounts = sorted(set([1, 2, 4, multiprocessing.cpu_count()]))
+    tolerance = 0.1
+
+    # Setup the argparse
+    parser = argparse.ArgumentParser(prog="montyhallsim_bench",
+                                    description='''Monty Hall Simulation benchmark. Runs the engines over a grid of round and worker counts
+                                            and records rounds/sec, parallel efficiency, peak RSS and startup time.''')
+    parser.add_argument("-e", "--engines", nargs="+", choices=sorted(engines), default=sorted(engines), help="Engines to run. Default is all of them.")
+    parser.add_argument("-r", "--rounds", nargs="+", type=int, default=roundCounts, help="Round counts to run. Integers. Default is " + " ".join(str(r) for r in roundCounts) + ".")
+    parser.add_argument("-w", "--workers", nargs="+", type=int, default=workerCounts, help="Thread or process counts to run. Integers. Default is " + " ".join(str(w) for w in workerCounts) + ".")
+    parser.add_argument("-n", "--repeat", type=int, default=1, help="Runs per point, the fastest is kept. Integer. Default is 1.")
+    parser.add_argument("-j", "--json", default=None, help="Write the results to the JSON file JSON.")
+    parser.add_argument("-b", "--baseline", default=None, help="Compare with the results stored in the JSON file BASELINE.")
+    parser.add_argument("-t", "--tolerance", type=float, default=tolerance, help="Slowdown allowed against the baseline before it is flagged. Float. Default is " + str(tolerance) + ".")
+    args = parser.parse_args()
+
+    print("Monty Hall Simulator Benchmark")
+    print("============================================================")
+    results = benchmark(args.engines, args.rounds, args.workers, max(args.repeat, 1))
+
+    if args.json:
+        with open(args.json, "w") as jsonFile:
+            json.dump({"machine": machine(), "results": results}, jsonFile, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as baselineFile:
+            regressions = compare(results, json.load(baselineFile), args.tolerance)
+        print("============================================================")
+        if regressions:
+            for engine, rounds, workers, change in regressions:
+                print("REGRESSION " + engine + " rounds " + str(rounds) + " workers " + str(workers) + " : " + str(round(change * 100, 1)) + " %")
+            sys.exit(1)
+        print("No regressions against " + args.baseline)
@@ -0,0 +1,72 @@
+# Monty Hall Simulator - Bit-Packed Rounds
+#######################################
+# Author: Dave Auld
+# Version: 1.0
+# Date: 18th October 2026
+# Description: Packs a 3 box round into
+# a single byte, so the full history of
+# a run can be kept in memory, one byte
+# per round. Pure Python helpers pack
+# one round at a time, the NumPy helpers
+# work on whole arrays of rounds.
+#
+# License: MIT
+#######################################
+
+# Byte layout of a round,
+#   bits 0-1  WinningNumber, 1-3
+#   bits 2-3  ParticipantPick, 1-3
+#   bits 4-5  HostShow, 1-3
+#   bit  6    ResultRandom
+#   bit  7    ResultSwap
+# ResultStick is not stored, with 3 boxes the participant wins by sticking
+# exactly when WinningNumber equals ParticipantPick.
+pickShift = 2
+hostShift = 4
+randomBit = 0x40
+swapBit = 0x80
+
+def checkPackable(doors, reveals):
+    # Only the classic game fits in a byte, 2 bits per box number.
+    if doors != 3 or reveals != 1:
+        raise ValueError("round history is only available for 3 boxes with the host opening 1")
+
+def packRound(round):
+    # Pack a round, [RoundNumber, WinningNumber, ParticipantPick, HostShow, ResultStick, ResultRandom, ResultSwap]
+    return (round[1] | round[2] << pickShift | round[3] << hostShift
+            | (randomBit if round[5] else 0) | (swapBit if round[6] else 0))
+
+def unpackRound(packed, roundNumber=0):
+    # Unpack a round byte, returns [RoundNumber, WinningNumber, ParticipantPick, HostShow, ResultStick, ResultRandom, ResultSwap]
+    winning = packed & 3
+    pick = packed >> pickShift & 3
+    return [roundNumber, winning, pick, packed >> hostShift & 3, winning == pick, bool(packed & randomBit), bool(packed & swapBit)]
+
+def encode(winning, pick, hostShow, resultRandom, resultSwap):
+    # Pack arrays of rounds into a uint8 array, one byte per round
+    import numpy as np
+    packed = np.asarray(winning, dtype=np.uint8).copy()
+    packed |= np.asarray(pick, dtype=np.uint8) << pickShift
+    packed |= np.asarray(hostShow, dtype=np.uint8) << hostShift
+    packed |= np.asarray(resultRandom, dtype=np.uint8) * np.uint8(randomBit)
+    packed |= np.asarray(resultSwap, dtype=np.uint8) * np.uint8(swapBit)
+    return packed
+
+def decode(packed):
+    # Unpack a uint8 array of rounds, returns the arrays
+    # [WinningNumber, ParticipantPick, HostShow, ResultStick, ResultRandom, ResultSwap]
+    import numpy as np
+    packed = np.frombuffer(packed, dtype=np.uint8) if not isinstance(packed, np.ndarray) else packed
+    winning = packed & 3
+    pick = packed >> pickShift & 3
+    return winning, pick, packed >> hostShift & 3, winning == pick, (packed & randomBit) != 0, (packed & swapBit) != 0
+
+def results(packed):
+    # Count the wins for each strategy, stick, random, swap, over packed rounds.
+    # Counts how often each of the 256 byte values occurs, then scores each value once.
+    import numpy as np
+    packed = np.frombuffer(packed, dtype=np.uint8) if not isinstance(packed, np.ndarray) else packed
+    valueCounts = np.bincount(packed, minlength=256)
+    values = np.arange(256)
+    stick = (values & 3) == (values >> pickShift & 3)
+    return [int(valueCounts[stick].sum()), int(valueCounts[(values & randomBit) != 0].sum()), int(valueCounts[(values & swapBit) != 0].sum())]
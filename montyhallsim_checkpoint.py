@@ -0,0 +1,150 @@
+# Monty Hall Simulator - Checkpoints
+#######################################
+# Author: Dave Auld
+# Version: 1.0
+# Date: 18th October 2026
+# Description: Tracks the blocks a run
+# has finished and their counts, and
+# saves them as a checkpoint file so an
+# interrupted run can be resumed. Each
+# block draws from its own random
+# stream, so the finished block numbers
+# are the whole random stream position,
+# and a resumed run only plays the
+# blocks that are left.
+#
+# License: MIT
+#######################################
+
+import json                                 # used for the checkpoint file
+import os                                   # used to replace the checkpoint file in one step
+import threading                            # blocks finish on several threads at once
+from timeit import default_timer as timer   # used for the time between saves
+from montyhallsim_core import blocks        # shared block streams
+
+# Checkpoint file version
+version = 1
+
+# Default seconds between checkpoint saves
+defaultInterval = 10.0
+
+# Settings a checkpoint belongs to, a run is only resumed from a checkpoint with the same settings
+checkpointSettings = ["kind", "seed", "rounds", "doors", "reveals", "blockSize"]
+
+class SimulationInterrupted(KeyboardInterrupt):
+    # Raised when a run is interrupted, result is the SimulationResult of the blocks finished so far.
+
+    def __init__(self, result):
+        KeyboardInterrupt.__init__(self, "simulation interrupted after " + str(result.rounds) + " rounds")
+        self.result = result
+
+def blockRanges(blockNumbers):
+    # Compress block numbers into sorted [First, Last] ranges
+    ranges = []
+    for blockNumber in sorted(blockNumbers):
+        if ranges and ranges[-1][1] == blockNumber - 1:
+            ranges[-1][1] = blockNumber
+        else:
+            ranges.append([blockNumber, blockNumber])
+    return ranges
+
+def readCheckpoint(path):
+    # Read a checkpoint file, returns its dictionary
+    with open(path) as checkpointFile:
+        saved = json.load(checkpointFile)
+    if saved.get("version") != version:
+        raise ValueError("unsupported checkpoint version " + str(saved.get("version")))
+    return saved
+
+class RunProgress:
+    # Blocks finished so far and their counts, [stick, random, swap]. With a path it is saved
+    # as a checkpoint at most every interval seconds, and whenever save() is called. The finished
+    # blocks are only kept with a path, as a watermark, every block below it finished, and the few
+    # blocks finished ahead of it, so they take the same memory however long the run.
+
+    def __init__(self, settings, path=None, interval=defaultInterval):
+        self.settings = settings
+        self.path = path
+        self.interval = interval
+        self.results = [0,0,0]
+        self.rounds = 0
+        self.watermark = 0                  # Every block number below it is finished
+        self.ahead = set()                  # Block numbers finished above the watermark
+        self.lock = threading.Lock()        # Blocks finish on the engine threads
+        self.lastSave = timer()
+
+    def restore(self, saved):
+        # Carry on from a checkpoint, raises ValueError if it was saved for other settings
+        for name in checkpointSettings:
+            if saved[name] != self.settings[name]:
+                raise ValueError("the checkpoint was saved with " + name + " " + str(saved[name]) + ", not " + str(self.settings[name]))
+        self.results = list(saved["results"])
+        self.rounds = saved["roundsPlayed"]
+        for first, last in saved["blocks"]:
+            if first <= self.watermark:
+                self.watermark = max(self.watermark, last + 1)
+            else:
+                self.ahead.update(range(first, last + 1))
+        self.raiseWatermark()
+
+    def start(self, rounds, results, firstBlock):
+        # Carry on from counts of the blocks before firstBlock
+        self.rounds = rounds
+        self.results = list(results)
+        self.watermark = max(self.watermark, firstBlock)
+        self.raiseWatermark()
+
+    def raiseWatermark(self):
+        # Move the watermark past the blocks finished ahead of it that now follow on from it
+        self.ahead = set(blockNumber for blockNumber in self.ahead if blockNumber >= self.watermark)
+        while self.watermark in self.ahead:
+            self.ahead.remove(self.watermark)
+            self.watermark += 1
+
+    def pendingBlocks(self, numberOfRounds, blockSize, firstBlock=0):
+        # The blocks of the run that have not been finished
+        for block in blocks(numberOfRounds, blockSize, max(firstBlock, self.watermark)):
+            if block[0] not in self.ahead:
+                yield block
+
+    def finishedRanges(self):
+        # The finished block numbers as sorted [First, Last] ranges
+        ranges = [[0, self.watermark - 1]] if self.watermark else []
+        for first, last in blockRanges(self.ahead):
+            if ranges and ranges[-1][1] == first - 1:
+                ranges[-1][1] = last
+            else:
+                ranges.append([first, last])
+        return ranges
+
+    def blockDone(self, block, result):
+        # Engines call this as each block finishes, with the block's own counts
+        with self.lock:
+            self.results[0] += result[0]
+            self.results[1] += result[1]
+            self.results[2] += result[2]
+            self.rounds += block[2]
+            if self.path:
+                if block[0] == self.watermark:
+                    self.watermark += 1
+                    while self.watermark in self.ahead:
+                        self.ahead.remove(self.watermark)
+                        self.watermark += 1
+                elif block[0] > self.watermark:
+                    self.ahead.add(block[0])
+                if timer() - self.lastSave >= self.interval:
+                    self.save()
+
+    def save(self):
+        # Write the checkpoint to a new file and swap it in, so a crash never leaves half a checkpoint
+        if not self.path:
+            return
+        saved = dict(self.settings)
+        saved["version"] = version
+        saved["results"] = self.results
+        saved["roundsPlayed"] = self.rounds
+        saved["blocks"] = self.finishedRanges()
+        with open(self.path + ".tmp", "w") as checkpointFile:
+            json.dump(saved, checkpointFile)
+        os.replace(self.path + ".tmp", self.path)
+        self.lastSave = timer()
@@ -0,0 +1,249 @@
+# Monty Hall Simulator - Command Line
+#######################################
+# Author: Dave Auld
+# Version: 1.0
+# Date: 18th October 2026
+# Description: Command line handling
+# shared by the simulator scripts.
+# Builds the argparse parser, turns the
+# arguments into simulate() settings
+# and displays the round output and
+# results.
+#
+# License: MIT
+#######################################
+
+import argparse                             # argparse added to support command line parameter functionality
+import sys                                  # used for the exit status of an interrupted run
+from montyhallsim_core import defaultDoors, defaultBlockSize, defaultConfidence, wilsonInterval, zScore, sequentialBlockSize
+from montyhallsim_api import checkSettings, simulate  # library entry point
+from montyhallsim_engines import engines, engineBlockSize  # used for the default block sizes
+from montyhallsim_checkpoint import SimulationInterrupted, readCheckpoint  # checkpoints and interrupts
+from montyhallsim_metrics import Metrics    # live metrics
+from montyhallsim_output import outputOrders  # orders of the round output
+from montyhallsim_tune import autoTune      # auto tuning of the engine, workers and block size
+
+def workerCount(text):
+    # Value of the worker option, a number or auto
+    if text == "auto":
+        return text
+    return int(text)
+
+def buildParser(blockSize, workerOption=None, blockHelp="Set the number of rounds per random stream block."):
+    # Parser with the options every script shares. workerOption is [Short, Long, Help] for scripts
+    # that run several threads or processes.
+    parser = argparse.ArgumentParser(prog="montyhallsim",
+                                    description='''Monty Hall Simulation. This is a basic Monty Hall Simulation, the program will run for a given number of rounds
+                                            and display the number of wins for the different methods (stick/random/swap).''',
+                                    epilog='''For more information on the Monty Hall paradox, visit; \n
+                                        https://en.wikipedia.org/wiki/Monty_Hall_problem''')
+    # Add argument for displaying the round output.
+    parser.add_argument("-o", "--output", action="store_true", help="Display individual round output. Default is hidden.")
+    parser.add_argument("--order", choices=outputOrders, default="completed", help="Order of the round output, as the rounds complete or by round number. Default is completed.")
+    parser.add_argument("-r", "--rounds", nargs=1, type=int, default=1000, help="Set the number of rounds. Integer. Default is 1000.")
+    if workerOption:
+        parser.add_argument(workerOption[0], workerOption[1], nargs=1, type=workerCount, default=None, dest="workers",
+                            help=workerOption[2] + ". auto picks the number and the block size that play the rounds fastest on this machine.")
+    parser.add_argument("-b", "--blocksize", nargs=1, type=int, default=blockSize, help=blockHelp + " Integer. Default is " + str(blockSize) + ".")
+    parser.add_argument("--auto", action="store_true", help="Pick the engine, the number of threads or processes and the block size that play the rounds fastest on this machine, from a calibration cached per machine. Default is off.")
+    parser.add_argument("--retune", action="store_true", help="Run the calibration for auto again, after the machine has changed.")
+    parser.add_argument("-s", "--seed", nargs=1, type=int, default=None, help="Set the master random seed. Non-negative Integer. Default is a new random seed.")
+    parser.add_argument("-d", "--doors", nargs=1, type=int, default=defaultDoors, help="Set the number of boxes. Integer. Default is " + str(defaultDoors) + ".")
+    parser.add_argument("-k", "--reveals", nargs=1, type=int, default=None, help="Set the number of losing boxes the host opens. Integer. Default is the number of boxes less 2.")
+    parser.add_argument("-e", "--precision", nargs=1, type=float, default=None, help="Stop once every win rate is known to +/- PRECISION, eg 0.001. --rounds becomes the upper limit, unlimited if not supplied. The block size defaults to at most " + str(defaultBlockSize) + ". Default is off.")
+    parser.add_argument("-c", "--confidence", nargs=1, type=float, default=defaultConfidence, help="Set the confidence level of the intervals in precision mode. Float. Default is " + str(defaultConfidence) + ".")
+    parser.add_argument("-l", "--log", nargs=1, default=None, help="Write every round to the binary round log LOG. Default is no log.")
+    parser.add_argument("-S", "--store", nargs=1, default=None, help="Reuse and save the counts in the result store database STORE. Default is no store.")
+    parser.add_argument("-C", "--checkpoint", nargs=1, default=None, help="Save the progress of the run to the checkpoint file CHECKPOINT every 10 seconds. Default is no checkpoint.")
+    parser.add_argument("-R", "--resume", action="store_true", help="Carry on from the checkpoint file, with the settings it was saved with.")
+    parser.add_argument("-T", "--trace", nargs=1, default=None, help="Stream the running win rates and their variance to TRACE, CSV or JSON lines when it ends .json or .jsonl. Default is no trace.")
+    parser.add_argument("--trace-stride", nargs=1, type=int, default=None, help="Trace every TRACE_STRIDE rounds instead of at 100, 1000, 10000 ... rounds.")
+    parser.add_argument("-m", "--metrics", nargs=1, type=float, default=None, help="Report live metrics every METRICS seconds to stderr. Float. Default is off.")
+    parser.add_argument("--metrics-file", nargs=1, default=None, help="Write the live metrics to the file METRICS_FILE instead of stderr.")
+    parser.add_argument("--phases", action="store_true", help="Add the time spent in each phase of the rounds to the metrics, slows the rounds down.")
+    parser.add_argument("--profile", nargs=1, default=None, help="Save a cProfile of the rounds played to PROFILE, read it with python -m pstats PROFILE.")
+    return parser
+
+def firstValue(value):
+    # If not supplied on cli, defaults value returns its own type, if supplied it returns a list, need 1st one.
+    if type(value) is list:
+        value = value[0]
+        if value == 0:                      # Prevent user providing 0 as a number
+            value = 1
+    return value
+
+def parseArguments(parser):
+    # Parse the command line, returns [Arguments, simulate() keyword arguments]
+    args = parser.parse_args()
+    settings = {
+        "rounds": firstValue(args.rounds),
+        "doors": firstValue(args.doors),
+        "confidence": firstValue(args.confidence),
+        "outputOrder": args.order,
+    }
+    if type(args.blocksize) is list:        # Only supplied on cli, otherwise the engine's own block size is used
+        settings["blockSize"] = firstValue(args.blocksize)
+    if getattr(args, "workers", None):
+        settings["workers"] = firstValue(args.workers)
+    if args.seed:
+        settings["seed"] = args.seed[0]
+    if args.reveals:
+        settings["reveals"] = args.reveals[0]
+    if args.precision:
+        settings["precision"] = args.precision[0]
+        if type(args.rounds) is int:        # Rounds not supplied on cli, no upper limit
+            settings["rounds"] = None
+    if args.log:
+        settings["logPath"] = args.log[0]
+    if args.store:
+        settings["storePath"] = args.store[0]
+    if args.trace:
+        settings["tracePath"] = args.trace[0]
+        if args.trace_stride:
+            settings["traceStride"] = args.trace_stride[0]
+    if args.checkpoint:
+        settings["checkpointPath"] = args.checkpoint[0]
+    if args.resume:
+        if not args.checkpoint:
+            parser.error("--resume needs --checkpoint")
+        # The run carries on with the settings the checkpoint was saved with
+        try:
+            saved = readCheckpoint(args.checkpoint[0])
+        except (OSError, ValueError) as e:
+            parser.error("can not resume, " + str(e))
+        for name in ["seed", "rounds", "doors", "reveals", "blockSize"]:
+            settings[name] = saved[name]
+        settings["resume"] = True
+    return args, settings
+
+def buildMetrics(args):
+    # Metrics asked for on the command line, None when there are none. Returns [Metrics, Metrics File].
+    if not (args.metrics or args.metrics_file or args.phases or args.profile):
+        return None, None
+    metricsFile = open(args.metrics_file[0], "a") if args.metrics_file else None
+    interval = args.metrics[0] if args.metrics else 1.0
+    return Metrics(max(interval, 0.01), metricsFile, args.phases, args.profile[0] if args.profile else None), metricsFile
+
+def printRound(round, workerName=None):
+    # Display the output for a round, with the thread or process that played it
+    text = str(round[0]) + ":" + str(round[1]) + ":" + str(round[2]) + ":" + str(round[3]) + ":" + str(round[4]) + ":" + str(round[5]) + ":" + str(round[6])
+    if workerName:
+        text += ":" + workerName
+    print(text)
+
+def printSettings(settings):
+    # Display the boxes, rounds and precision of a run
+    doors = settings["doors"]
+    reveals = settings["reveals"]
+    print("Monty Hall Simulator, " + str(doors) + " boxes, host opens " + str(reveals) + ".")
+    if settings.get("precision"):
+        print("Precision: +/- " + str(settings["precision"]) + " at " + str(settings["confidence"] * 100) + "% confidence")
+    if settings["rounds"] is not None:
+        print("Number of Rounds: " + str(settings["rounds"]))
+
+def printResults(result, precision=None):
+    # Display the wins for each strategy, and the intervals in precision mode
+    numberOfRounds = result.rounds
+    results = result.results
+    print("Duration, " + str(result.duration) + " seconds.")
+    print("Stick  = " + str(results[0]) + " : " + str((float(results[0]) / numberOfRounds) * 100) + " %")
+    print("Random = " + str(results[1]) + " : " + str((float(results[1]) / numberOfRounds) * 100) + " %")
+    print("Swap   = " + str(results[2]) + " : " + str((float(results[2]) / numberOfRounds) * 100) + " %")
+    if precision:
+        printIntervals(results, numberOfRounds, result.confidence)
+
+def printIntervals(results, rounds, confidence):
+    # Display the confidence interval of each strategy's win rate
+    z = zScore(confidence)
+    for name, wins in zip(["Stick ", "Random", "Swap  "], results):
+        low, high = wilsonInterval(wins, rounds, z)
+        print(name + " " + str(confidence * 100) + "% CI = " + str(low * 100) + " % to " + str(high * 100) + " %")
+
+def printInterrupted(result, checkpointPath=None):
+    # Display the partial results of an interrupted run
+    print("Interrupted, results for the " + str(result.rounds) + " rounds finished.")
+    print("============================================================")
+    if result.rounds:
+        printResults(result)
+    if checkpointPath:
+        print("Checkpoint saved to " + checkpointPath + ", carry on with --resume.")
+
+def parseAddress(parser, text):
+    # Turn HOST:PORT into (Host, Port)
+    host, separator, port = text.rpartition(":")
+    if not separator or not port.isdigit():
+        parser.error("expected an address as HOST:PORT, not " + text)
+    return (host or "0.0.0.0", int(port))
+
+def run(parser, engine, banner=None, resultsHeader=None, options=None):
+    # Parse the command line, run the simulation and display it. engine is the engine name, or a
+    # function returning it from the arguments. banner(settings) displays any extra settings lines,
+    # resultsHeader(result) returns the line shown above the results, options(args) returns any
+    # extra simulate() settings of the script.
+    args, settings = parseArguments(parser)
+    if options:
+        settings.update(options(args))
+    roundOutput = args.output
+    if callable(engine):
+        engine = engine(args)
+    if args.auto:
+        engine = "auto"
+    try:
+        rounds, settings["reveals"], settings["seed"] = checkSettings(engine, settings["rounds"], settings["doors"], settings.get("reveals"),
+                                                                      settings.get("seed"), settings.get("precision"), settings["confidence"], settings.get("logPath"),
+                                                                      blockSize=settings.get("blockSize"), workers=settings.get("workers"))
+    except ValueError as e:
+        parser.error(str(e))
+
+    # Tune before the settings are shown, so they show what will be played
+    blockSupplied = "blockSize" in settings
+    tuning = None
+    if engine == "auto" or settings.get("workers") == "auto":
+        try:
+            tuning = autoTune(rounds, None if engine == "auto" else engine, None if settings.get("workers") == "auto" else settings.get("workers"),
+                              settings.get("blockSize"), bool(roundOutput or settings.get("logPath")), bool(settings.get("tracePath")),
+                              retune=args.retune, progress=lambda name: print("Calibrating the " + name + " engine for this machine..."))
+        except ValueError as e:
+            parser.error(str(e))
+        except KeyboardInterrupt:
+            print("Interrupted.")
+            sys.exit(130)
+        engine = tuning.engine
+        settings["workers"] = tuning.workers
+        settings["blockSize"] = tuning.blockSize
+
+    if settings.get("precision") and not blockSupplied:
+        settings["blockSize"] = sequentialBlockSize(settings.get("blockSize") or engineBlockSize(engine))
+
+    printSettings(settings)
+    if args.auto:
+        # The script's own banner describes its own engine
+        print("Auto tuned for " + str(tuning.cpus) + " cpus: " + engine + " engine, " + str(tuning.workers) + " workers, block size " + str(tuning.blockSize))
+    elif banner:
+        banner(settings)
+    print("Seed: " + str(settings["seed"]))
+    if roundOutput == True:
+        header = "RoundNumber, WinningNumber, ParticipantPick, HostShow, ResultStick, ResultRandom, ResultSwap"
+        if getattr(engines[engine], "concurrentOutput", False):
+            header += ", Process" if engine == "multiproc" else ", Thread"   # printRound adds the worker that played the round
+        print(header)
+
+    metrics, metricsFile = buildMetrics(args)
+    try:
+        result = simulate(engine=engine, output=printRound if roundOutput else None, metrics=metrics, **settings)
+    except (ValueError, ImportError) as e:
+        parser.error(str(e))
+    except SimulationInterrupted as e:
+        # Show what was finished before Ctrl-C instead of a traceback
+        printInterrupted(e.result, settings.get("checkpointPath"))
+        sys.exit(130)
+    finally:
+        if metricsFile:
+            metricsFile.close()
+
+    print(resultsHeader(result) if resultsHeader and not args.auto else "Results for Number of Rounds: " + str(result.rounds))
+    print("============================================================")
+    if result.storedRounds:
+        print("Rounds from store: " + str(result.storedRounds))
+    printResults(result, settings.get("precision"))
+    return result
@@ -0,0 +1,256 @@
+# Monty Hall Simulator - Shared Core
+#######################################
+# Author: Dave Auld
+# Version: 1.3
+# Date: 18th October 2026
+# Description: Round logic and helpers
+# shared by the simulator engines, for
+# any number of boxes with the host
+# opening any number of them. Rounds
+# are split into fixed blocks, each
+# block draws from its own random
+# stream derived from the master seed,
+# so a seeded run gives the same counts
+# no matter how many threads or
+# processes play it. The draws of a
+# block are taken in bulk from
+# getrandbits and cut into unbiased
+# values by lookup tables, so the pure
+# Python rounds need no third party
+# packages to run fast. Also drives the
+# sequential mode, which plays batches
+# of blocks until the confidence
+# interval of every strategy's win rate
+# is within the requested precision.
+#
+# License: MIT
+#######################################
+
+import random                               # used for the per block random streams
+from itertools import chain, islice, repeat  # used to take the next batch of blocks, and to cut the bulk draws into values
+from operator import eq, and_, not_          # used to score whole chunks of rounds at once
+from math import sqrt, ceil                 # used for the confidence intervals
+from statistics import NormalDist           # used to turn the confidence level into a z score
+
+# Default number of boxes, and boxes the host opens
+defaultDoors = 3
+defaultReveals = 1
+
+# Default number of rounds in a block. The block size is part of the random
+# stream layout, a seeded run only repeats exactly with the same block size.
+defaultBlockSize = 10000
+
+# Default confidence level of the intervals in the sequential mode
+defaultConfidence = 0.95
+
+# Bytes drawn from a stream at a time, and rounds scored at a time when only the counts are needed
+refillBytes = 1024
+chunkRounds = 4096
+
+# Lookup tables of the values in each byte, by range, and of the host's boxes, by number of boxes
+byteTables = {}
+hostTables = {}
+
+# Largest number of boxes the host's boxes are looked up for, above it they are worked out
+hostTableDoors = 16
+
+def newSeed():
+    # Master seed for runs where the user did not supply one, drawn from the OS entropy source.
+    return random.SystemRandom().getrandbits(64)
+
+def blocks(numberOfRounds, blockSize, firstBlock=0):
+    # Generate the (BlockNumber, FirstRound, RoundCount) blocks lazily so the block list never sits in memory.
+    # firstBlock skips the blocks before it, for runs that carry on from earlier counts.
+    for blockNumber, firstRound in enumerate(range(1 + firstBlock * blockSize, numberOfRounds + 1, blockSize), firstBlock):
+        yield (blockNumber, firstRound, min(blockSize, numberOfRounds + 1 - firstRound))
+
+def blockRandom(seed, blockNumber, purpose=None):
+    # Random stream for one block. Seeding from the "seed:block" string runs it through
+    # sha512, so neighbouring blocks get unrelated Mersenne Twister states. Each purpose
+    # of a draw gets its own stream of the block, "seed:block:purpose".
+    if purpose is None:
+        return random.Random(str(seed) + ":" + str(blockNumber))
+    return random.Random(str(seed) + ":" + str(blockNumber) + ":" + purpose)
+
+def byteTable(n):
+    # For each byte value, the tuple of uniform values from 0 to n-1 it holds. The byte is cut into chunks
+    # of the fewest bits of 1, 2, 4 or 8 that cover n, and a chunk at or above the largest multiple
+    # of n below 2**bits is rejected, so every value is equally likely. 3 boxes use 2 bit chunks.
+    table = byteTables.get(n)
+    if table is None:
+        bits = next(bits for bits in (1, 2, 4, 8) if 1 << bits >= n)
+        limit = (1 << bits) // n * n
+        table = tuple(tuple(chunk % n for chunk in ((byte >> shift) & ((1 << bits) - 1) for shift in range(0, 8, bits)) if chunk < limit)
+                      for byte in range(256))
+        byteTables[n] = table
+    return table
+
+def uniformValues(seed, blockNumber, purpose, n):
+    # Endless iterator of uniform values from 0 to n-1 from the block's stream for purpose. The stream is
+    # drawn refillBytes at a time with getrandbits and cut up by byteTable, all without a Python call per value.
+    if n == 1:
+        return repeat(0)
+    rng = blockRandom(seed, blockNumber, purpose)
+    if n > 256:
+        return iter(lambda: rng.randrange(n), None)
+    refill = lambda: rng.getrandbits(refillBytes * 8).to_bytes(refillBytes, "little")
+    return chain.from_iterable(map(byteTable(n).__getitem__, chain.from_iterable(iter(refill, None))))
+
+def hostTable(doors):
+    # hostTable(doors)[winning][pick] is the tuple of boxes the host can show, neither the winning box nor the pick
+    table = hostTables.get(doors)
+    if table is None:
+        table = tuple(tuple(tuple(box for box in range(1, doors + 1) if box != winning and box != pick) for pick in range(doors + 1))
+                      for winning in range(doors + 1))
+        hostTables[doors] = table
+    return table
+
+class BlockDraws:
+    # The draws of one block, each purpose from its own stream as 0 based values, so every round uses the
+    # same values whether or not the rounds are output. winning and pick are the boxes, hostPicked and
+    # hostOther the host's box when the pick was right or wrong, swap the box swapped to, randomStick whether
+    # random keeps the pick and randomBox the box random moves to. The winning box is the first of the
+    # closed boxes swap and random can move to, so a draw of 0 finds it.
+
+    def __init__(self, seed, blockNumber, doors, reveals):
+        closedOthers = doors - 1 - reveals
+        self.winning = uniformValues(seed, blockNumber, "winning", doors)
+        self.pick = uniformValues(seed, blockNumber, "pick", doors)
+        self.hostPicked = uniformValues(seed, blockNumber, "hostPicked", doors - 1)
+        self.hostOther = uniformValues(seed, blockNumber, "hostOther", doors - 2)
+        self.swap = uniformValues(seed, blockNumber, "swap", closedOthers)
+        self.randomStick = uniformValues(seed, blockNumber, "randomStick", closedOthers + 1)
+        self.randomBox = uniformValues(seed, blockNumber, "randomBox", closedOthers)
+        self.hostBoxes = hostTable(doors) if doors <= hostTableDoors else None
+
+def blockGenerator(seed, blockNumber):
+    # NumPy random stream for one block, spawned from the master seed with the block as the spawn key.
+    import numpy as np
+    return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(blockNumber,)))
+
+def checkDoors(doors, reveals):
+    # The host must open at least one box and leave at least one box to swap to.
+    if doors < 3:
+        raise ValueError("the number of boxes must be at least 3")
+    if reveals < 1 or reveals > doors - 2:
+        raise ValueError("the host must open between 1 and " + str(doors - 2) + " boxes")
+
+def playRound(draws, round, doors=defaultDoors, reveals=defaultReveals):
+    # Play one round from the block's draws, filling in round [RoundNumber, WinningNumber, ParticipantPick, HostShow, ResultStick, ResultRandom, ResultSwap]
+
+    # Select the rounds winning box, and the participant random choice
+    round[1] = next(draws.winning) + 1
+    round[2] = next(draws.pick) + 1
+
+    # Host does their reveal next.
+    hostPick(draws, round, doors, reveals)
+
+    #Participant has their 2nd choice next
+    participantChoiceResult(draws, round, doors, reveals)
+    return round
+
+def hostPick(draws, round, doors, reveals):
+    # The host opens a random set of reveals boxes from those that are neither the
+    # winning box nor the participant pick. Any one opened box is then uniform over
+    # those boxes, so the box recorded as HostShow is drawn directly instead of
+    # building the opened set, and looked up in the host table when there is one.
+    box = next(draws.hostPicked) if round[1] == round[2] else next(draws.hostOther)
+    if draws.hostBoxes:
+        round[3] = draws.hostBoxes[round[1]][round[2]][box]
+    else:
+        round[3] = boxExcluding(box + 1, round[1], round[2])
+
+def participantChoiceResult(draws, round, doors, reveals):
+    # Each strategy draws every round, so the rounds stay in step with the counts only path, scoreChunk.
+
+    # 1st Case Participant Sticks
+    round[4] = round[1] == round[2]
+
+    # 3rd Case Participant Swaps to one of the other closed boxes. If the pick was wrong,
+    # the winning box is one of the boxes left, otherwise the participant loses.
+    swapBox = next(draws.swap)
+    round[6] = round[1] != round[2] and swapBox == 0
+
+    # 2nd Case Participant Picks Random box from the closed boxes, including the original pick
+    keep = next(draws.randomStick) == 0
+    randomBox = next(draws.randomBox)
+    round[5] = round[4] if keep else round[1] != round[2] and randomBox == 0
+
+def boxExcluding(box, first, second):
+    # Step a box drawn from the boxes less first and second (which may be the same box) past them
+    low, high = min(first, second), max(first, second)
+    if box >= low:
+        box += 1
+        if low != high and box >= high:
+            box += 1
+    return box
+
+def playCounts(draws, roundCount, result):
+    # Play roundCount rounds from the block's draws when only the counts are needed, adding the wins into
+    # result. The rounds are scored a chunk at a time with operator maps, so there is no Python call per round.
+    # The host's box does not change the wins, so it is not drawn.
+    while roundCount > 0:
+        count = min(roundCount, chunkRounds)
+        roundCount -= count
+        correct = list(map(eq, islice(draws.winning, count), islice(draws.pick, count)))
+        wrong = list(map(not_, correct))
+        keep = list(map(not_, islice(draws.randomStick, count)))
+        result[0] += correct.count(True)
+        result[1] += (sum(map(and_, keep, correct))
+                      + sum(map(and_, map(and_, map(not_, keep), wrong), map(not_, islice(draws.randomBox, count)))))
+        result[2] += sum(map(and_, wrong, map(not_, islice(draws.swap, count))))
+
+def zScore(confidence):
+    # Two sided z score for a confidence level, 0.95 gives 1.96
+    return NormalDist().inv_cdf(0.5 + confidence / 2)
+
+def wilsonInterval(wins, rounds, z):
+    # Wilson score interval for a win rate, returns (low, high). Unlike the normal
+    # approximation it stays inside 0 to 1 and behaves for rates near 0 or 1.
+    if rounds == 0:
+        return (0.0, 1.0)
+    rate = float(wins) / rounds
+    centre = (rate + z * z / (2 * rounds)) / (1 + z * z / rounds)
+    halfWidth = z * sqrt(rate * (1 - rate) / rounds + z * z / (4 * rounds * rounds)) / (1 + z * z / rounds)
+    return (centre - halfWidth, centre + halfWidth)
+
+def withinPrecision(results, rounds, precision, z):
+    # True when the interval of every strategy is within +/- precision of its estimate
+    for wins in results:
+        low, high = wilsonInterval(wins, rounds, z)
+        if (high - low) / 2 > precision:
+            return False
+    return True
+
+def roundsForPrecision(results, rounds, precision, z):
+    # Estimate of the total rounds needed for the widest interval to reach +/- precision,
+    # from the normal approximation with the current rates.
+    worst = max(float(wins) / rounds * (1 - float(wins) / rounds) for wins in results)
+    return int(ceil(z * z * max(worst, 1.0 / rounds) / (precision * precision)))
+
+def sequentialBlockSize(blockSize):
+    # Default block size of a sequential run. The first batch is one block, so the block size of the
+    # large block engines is capped, otherwise they would play far more rounds than a loose precision needs.
+    return min(blockSize, defaultBlockSize)
+
+def runSequential(playBlocks, results, numberOfRounds, blockSize, precision, z):
+    # Play batches of blocks until every strategy's win rate is within +/- precision,
+    # or numberOfRounds have been played. playBlocks(blockList, results) plays the blocks
+    # and adds their wins to results. Each batch is sized from the rounds still estimated to be
+    # needed, at most doubling the rounds played so far. The batches only depend on the
+    # counts, so a seeded run stops at the same round however the blocks are played.
+    # Returns the number of rounds played.
+    pendingBlocks = blocks(numberOfRounds, blockSize)
+    rounds = 0
+    batchBlocks = 1
+    while True:
+        batch = list(islice(pendingBlocks, batchBlocks))
+        if not batch:
+            break
+        playBlocks(batch, results)
+        rounds += sum(block[2] for block in batch)
+        if withinPrecision(results, rounds, precision, z):
+            break
+        needed = roundsForPrecision(results, rounds, precision, z) - rounds
+        batchBlocks = max(1, min(int(ceil(float(needed) / blockSize)), int(ceil(float(rounds) / blockSize))))
+    return rounds
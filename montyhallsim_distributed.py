@@ -0,0 +1,39 @@
+# Monty Hall Simulator - Distributed
+#######################################
+# Author: Dave Auld
+# Version: 1.0
+# Date: 18th October 2026
+# Description: Monty Hall Simulation
+# coordinator, hands blocks of rounds
+# to workers on other machines over TCP,
+# and hands the blocks of any worker
+# that is lost to the others. Workers
+# are started with
+# montyhallsim_worker.py, or on this
+# machine with --local. Command line
+# wrapper around
+# montyhallsim_api.simulate.
+#
+# License: MIT
+#######################################
+
+from montyhallsim_cli import buildParser, run, parseAddress  # shared command line handling
+from montyhallsim_engines import DistributedEngine  # used for the default block size
+
+def main():
+    parser = buildParser(DistributedEngine.blockSize,
+                         ["-w", "--local", "Start LOCAL workers on this machine, connected over the loopback interface. Integer. Default is none."],
+                         "Set the number of rounds handed to a worker at a time and per random stream block.")
+    parser.add_argument("-L", "--listen", default="0.0.0.0:8766", help="Address to listen for workers on, HOST:PORT. Default is 0.0.0.0:8766.")
+
+    def banner(settings):
+        print("Listening for workers on " + settings["address"][0] + ":" + str(settings["address"][1]))
+        print("Block size: " + str(settings.get("blockSize", DistributedEngine.blockSize)))
+
+    def resultsHeader(result):
+        return "Results for " + str(result.rounds) + " rounds, using " + str(result.workers) + " workers."
+
+    run(parser, "distributed", banner, resultsHeader, lambda args: {"address": parseAddress(parser, args.listen)})
+
+if __name__ == "__main__":
+    main()
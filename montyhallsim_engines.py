@@ -0,0 +1,984 @@
+# Monty Hall Simulator - Engines
+#######################################
+# Author: Dave Auld
+# Version: 1.2
+# Date: 18th October 2026
+# Description: The simulation engines,
+# single thread, threaded, process pool,
+# NumPy vectorized, NumPy threaded,
+# distributed over TCP and aggregate,
+# which draws the counts without playing
+# the rounds. Each engine
+# plays lists of round blocks and adds
+# the wins into a results list, and
+# keeps no module level state, so any
+# number of simulations can run at once.
+# playBlocks(blockList, results, blockDone)
+# calls blockDone(block, result) with the
+# counts of each block as it finishes,
+# and stops cleanly on Ctrl-C. Engines
+# given a montyhallsim_metrics.Metrics
+# report their progress to it.
+#
+# License: MIT
+#######################################
+
+import json                                 # used for the distributed engine messages
+import multiprocessing                      # Required to get CPU max logical cores, and support multiprocess/pools
+import os                                   # used to name distributed workers
+import signal                               # used to leave Ctrl-C to the parent process
+import socket                               # used by the distributed engine
+import threading                            # Required for multi-threading
+import time                                 # used by distributed workers waiting to reconnect
+from collections import deque               # blocks the distributed engine hands out again
+from functools import partial               # used to pass multiple parameters into pool.imap_unordered
+from itertools import chain, islice         # used to put back the first block of a distributed run, and take batches of blocks
+from timeit import default_timer as timer   # used for the phase times
+from montyhallsim_core import defaultBlockSize, BlockDraws, blockGenerator, playRound, playCounts, hostPick, participantChoiceResult  # shared round logic and block random streams
+from montyhallsim_roundlog import RoundLogWriter  # binary round log
+from montyhallsim_bitpack import packRound, encode  # byte per round history
+from montyhallsim_metrics import phaseNames, profileCall  # live metrics
+from montyhallsim_output import RoundWriter, BatchCollector, defaultBufferBatches  # writer stage of the round output
+
+def playBlock(block, seed, doors, reveals, result, output=None, logPath=None, history=None, phases=None, marks=None):
+    # Play a contiguous block of rounds, block is (BlockNumber, FirstRound, RoundCount), adding the wins into result.
+    # output, when set, is called with each round. history, when set, is a writable buffer of the block's
+    # RoundCount bytes that each round is packed into. phases, when set, is a dictionary the seconds
+    # spent in each phase of the rounds are added to. marks, when set, is a list of round numbers in the
+    # block, and (RoundNumber, [stick, random, swap]) with the block's counts up to each one is returned.
+    if phases is not None:
+        return playBlockPhases(block, seed, doors, reveals, result, output, logPath, history, phases, marks)
+    blockNumber, firstRound, roundCount = block
+    draws = BlockDraws(seed, blockNumber, doors, reveals)
+    startCounts = list(result)
+    snapshots = []
+
+    # Each block writes its rounds straight into their own slots of the round log.
+    roundLog = RoundLogWriter(logPath, firstRound) if logPath else None
+    countsOnly = not (output or roundLog or history is not None)
+    segmentStart = firstRound
+    for segmentEnd in (marks or []) + [None]:
+        # The rounds up to the next mark, or to the end of the block
+        segmentStop = firstRound + roundCount if segmentEnd is None else segmentEnd + 1
+        if countsOnly:
+            # Only the counts are needed, whole chunks of rounds are scored at once
+            playCounts(draws, segmentStop - segmentStart, result)
+        else:
+            for currentRound in range(segmentStart, segmentStop):
+                # current round array contains, [RoundNumber, WinningNumber, ParticipantPick, HostShow, ResultStick, ResultRandom, ResultSwap]
+                round = [currentRound,0,0,0,False,False,False]
+
+                # Winning box and participant pick, then the host reveal and the participant's 2nd choice
+                playRound(draws, round, doors, reveals)
+
+                # Increment Win counts
+                if round[4]:
+                    result[0] += 1
+                if round[5]:
+                    result[1] += 1
+                if round[6]:
+                    result[2] += 1
+
+                #Show round output
+                if output:
+                    output(round)
+
+                if roundLog:
+                    roundLog.write(round)
+
+                if history is not None:
+                    history[currentRound - firstRound] = packRound(round)
+        if segmentEnd is not None:
+            snapshots.append((segmentEnd, [result[i] - startCounts[i] for i in range(3)]))
+            segmentStart = segmentEnd + 1
+    if roundLog:
+        roundLog.close()
+    return snapshots
+
+def playBlockPhases(block, seed, doors, reveals, result, output, logPath, history, phases, marks=None):
+    # playBlock with each phase of every round timed, see montyhallsim_metrics.phaseNames
+    blockNumber, firstRound, roundCount = block
+    draws = BlockDraws(seed, blockNumber, doors, reveals)
+    roundLog = RoundLogWriter(logPath, firstRound) if logPath else None
+    rngTime = hostTime = scoringTime = outputTime = 0.0
+    startCounts = list(result)
+    snapshots = []
+    marks = set(marks or [])
+    for currentRound in range(firstRound, firstRound + roundCount):
+        round = [currentRound,0,0,0,False,False,False]
+        startTime = timer()
+        round[1] = next(draws.winning) + 1
+        round[2] = next(draws.pick) + 1
+        rngDone = timer()
+        hostPick(draws, round, doors, reveals)
+        hostDone = timer()
+        participantChoiceResult(draws, round, doors, reveals)
+        if round[4]:
+            result[0] += 1
+        if round[5]:
+            result[1] += 1
+        if round[6]:
+            result[2] += 1
+        scoringDone = timer()
+        if output:
+            output(round)
+        if roundLog:
+            roundLog.write(round)
+        if history is not None:
+            history[currentRound - firstRound] = packRound(round)
+        outputDone = timer()
+        rngTime += rngDone - startTime
+        hostTime += hostDone - rngDone
+        scoringTime += scoringDone - hostDone
+        outputTime += outputDone - scoringDone
+        if currentRound in marks:
+            snapshots.append((currentRound, [result[i] - startCounts[i] for i in range(3)]))
+    if roundLog:
+        roundLog.close()
+    phases["rng"] += rngTime
+    phases["host"] += hostTime
+    phases["scoring"] += scoringTime
+    phases["output"] += outputTime
+    return snapshots
+
+def measuredBlock(metrics, workerName, block, seed, doors, reveals, result, output=None, logPath=None, history=None, marks=None):
+    # playBlock, counted against the worker and profiled when metrics is set. Returns the counts at the marks.
+    if metrics is None:
+        return playBlock(block, seed, doors, reveals, result, output, logPath, history, None, marks)
+    stats = metrics.worker(workerName)
+    snapshots = metrics.profile(playBlock, block, seed, doors, reveals, result, output, logPath, history, stats.phases, marks)
+    stats.rounds += block[2]
+    return snapshots
+
+def streamKind(engine):
+    # The random streams an engine plays. The Python engines all give the same counts for a seed and
+    # block size, as do the NumPy engines, so results can be shared between engines of a kind.
+    # The jit engine plays the Python streams when it falls back to the process pool.
+    if engine == "aggregate":
+        return "aggregate"
+    if engine == "jit":
+        return "jit" if loadJit() else "python"
+    return "numpy" if engine.startswith("numpy") else "python"
+
+def engineBlockSize(engine):
+    # Default block size of an engine. Without numba the jit engine plays the process pool's blocks,
+    # so its counts match the multiproc engine for the same seed.
+    if engine == "jit" and not loadJit():
+        return MultiprocEngine.blockSize
+    return engines[engine].blockSize
+
+def blockHistory(history, block):
+    # The slice of the run history that holds a block's rounds, None without a history
+    if history is None:
+        return None
+    blockNumber, firstRound, roundCount = block
+    return memoryview(history)[firstRound - 1:firstRound - 1 + roundCount]
+
+class SingleEngine:
+    # Plays every block in the calling thread.
+    blockSize = defaultBlockSize
+    traces = True
+
+    def __init__(self, seed, doors, reveals, workers=1, output=None, logPath=None, history=None, metrics=None, trace=None):
+        self.seed = seed
+        self.doors = doors
+        self.reveals = reveals
+        self.workers = 1
+        self.output = output
+        self.logPath = logPath
+        self.history = history
+        self.metrics = metrics
+        self.trace = trace
+
+    def playBlocks(self, blockList, results, blockDone=None):
+        output = None
+        if self.output:
+            output = lambda round: self.output(round, None)
+        for block in blockList:
+            result = [0,0,0]
+            snapshots = measuredBlock(self.metrics, "main", block, self.seed, self.doors, self.reveals, result, output, self.logPath,
+                                      blockHistory(self.history, block), self.trace.marks(block) if self.trace else None)
+            results[0] += result[0]
+            results[1] += result[1]
+            results[2] += result[2]
+            if self.trace:
+                self.trace.add(block, result, snapshots)
+            if blockDone:
+                blockDone(block, result)
+
+    def close(self):
+        pass
+
+class ThreadedEngine:
+    # Threads claim blocks until none are left. Each block's win counts are added under
+    # resultsLock, and round output is passed in batches to a writer thread.
+    blockSize = defaultBlockSize
+    concurrentOutput = True
+    traces = True
+
+    def __init__(self, seed, doors, reveals, workers=None, output=None, logPath=None, history=None, metrics=None,
+                 outputOrder="completed", trace=None):
+        self.seed = seed
+        self.doors = doors
+        self.reveals = reveals
+        self.workers = workers or multiprocessing.cpu_count()
+        self.logPath = logPath
+        self.history = history
+        self.metrics = metrics
+        self.trace = trace
+        self.currentRoundLock = threading.Lock()    # Each Thread needs to aquire this lock for claiming the next block of rounds.
+        self.resultsLock = threading.Lock()         # Each Thread needs to acquire this lock for updating results.
+        self.stopping = threading.Event()           # Set on Ctrl-C, the threads stop claiming blocks.
+        self.writer = RoundWriter(output, outputOrder, window=self.workers * 2) if output else None
+        if metrics and output:
+            metrics.addQueue("outputQ", self.writer.depth)
+
+    def playBlocks(self, blockList, results, blockDone=None):
+        pendingBlocks = iter(blockList)
+
+        # Register the threads upto the thread limit
+        threads = []
+        for t in range(self.workers):
+            newThread = threading.Thread(target=self.runBlocks, args=(pendingBlocks, results, blockDone), name="t"+str(t))
+            threads.append(newThread)
+
+        for t in threads:
+            t.start()
+
+        try:
+            joinThreads(threads, self.stopping)
+        except KeyboardInterrupt:
+            if self.writer:
+                self.writer.stop()
+            raise
+
+    def runBlocks(self, pendingBlocks, results, blockDone):
+        workerName = threading.current_thread().name
+        collector = self.writer.collector(workerName) if self.writer else None
+        while not self.stopping.is_set():
+            # Claim the next block of rounds, noting its place in the output
+            self.acquire(self.currentRoundLock, "currentRoundLock", workerName)
+            block = next(pendingBlocks, None)
+            if block is not None and self.writer:
+                sequence = self.writer.expect(block)
+            self.currentRoundLock.release()
+            if block is None:
+                break
+            if self.writer:
+                self.writer.admit(sequence)
+
+            # Wins are counted locally for the block, then added to the shared results under the lock.
+            result = [0,0,0]
+            snapshots = measuredBlock(self.metrics, workerName, block, self.seed, self.doors, self.reveals, result,
+                                      collector, self.logPath, blockHistory(self.history, block), self.trace.marks(block) if self.trace else None)
+            if collector:
+                collector.flush()
+            self.acquire(self.resultsLock, "resultsLock", workerName)
+            results[0] += result[0]
+            results[1] += result[1]
+            results[2] += result[2]
+            self.resultsLock.release()
+            if self.trace:
+                self.trace.add(block, result, snapshots)
+            if blockDone:
+                blockDone(block, result)
+
+    def acquire(self, lock, name, workerName):
+        # Acquire a lock, timing the wait when there are metrics
+        if self.metrics:
+            self.metrics.timedAcquire(lock, name, self.metrics.worker(workerName))
+        else:
+            lock.acquire()
+
+    def close(self):
+        if self.writer:
+            self.writer.close()
+
+def joinThreads(threads, stopping):
+    # Wait for the threads. On Ctrl-C the threads are told to stop, and are waited for
+    # before the interrupt is passed on, so no thread is left playing.
+    try:
+        for t in threads:
+            t.join()
+    except KeyboardInterrupt:
+        stopping.set()
+        for t in threads:
+            t.join()
+        raise
+
+def processBlock(block, seed, doors, reveals, output, logPath=None, history=False, metrics=None, schedule=None):
+    # Pool task, plays a block with local win counts and passes back (Block, (stick, random, swap), Packed, Stats, Snapshots).
+    # With output the rounds are put on the shared output queue in batches. Packed is the block's rounds, one
+    # byte per round, with history, otherwise None. metrics is (Phases, Profile) when the parent has
+    # metrics, and Stats is then (ProcessName, Phase Times, Profile Stats). schedule is the
+    # montyhallsim_trace.TraceSchedule of a traced run, and Snapshots the block's counts at its trace rounds.
+    result = [0,0,0]                    # [stick, random, swap]
+    packed = bytearray(block[2]) if history else None
+    collector = BatchCollector(outputQ.put, multiprocessing.current_process().name) if output else None
+    marks = schedule.marks(block[1], block[1] + block[2] - 1) if schedule else None
+    if metrics is None:
+        snapshots = playBlock(block, seed, doors, reveals, result, collector, logPath, packed, None, marks)
+        if collector:
+            collector.flush()
+        return (block, tuple(result), packed, None, snapshots)
+
+    phases = dict.fromkeys(phaseNames, 0.0) if metrics[0] else None
+    arguments = (block, seed, doors, reveals, result, collector, logPath, packed, phases, marks)
+    profileStats = None
+    if metrics[1]:
+        snapshots, profileStats = profileCall(playBlock, *arguments)
+    else:
+        snapshots = playBlock(*arguments)
+    if collector:
+        collector.flush()
+    return (block, tuple(result), packed, (multiprocessing.current_process().name, phases, profileStats), snapshots)
+
+def initProc(outQ):
+    # Used by the process pool to initialize the shared global queue on the child processes
+    global outputQ          # The shared queue
+    outputQ = outQ
+
+    # Ctrl-C is handled by the parent, which stops the pool
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+class MultiprocEngine:
+    # Hands blocks to a process pool and reduces the block results as they arrive. Round output is put
+    # on a bounded queue in batches, and output by a writer thread while the pool plays on.
+    blockSize = defaultBlockSize
+    concurrentOutput = True
+    traces = True
+
+    def __init__(self, seed, doors, reveals, workers=None, output=None, logPath=None, history=None, metrics=None,
+                 outputOrder="completed", trace=None):
+        self.workers = workers or multiprocessing.cpu_count()
+        self.history = history
+        self.metrics = metrics
+        self.trace = trace
+
+        # Bounded queue for passing batches of round output from pool processes to the writer in the parent
+        self.outputQ = multiprocessing.Queue(defaultBufferBatches) if output else None
+        self.writer = RoundWriter(output, outputOrder, self.outputQ, window=self.workers * 2) if output else None
+        self.target = partial(processBlock, seed=seed, doors=doors, reveals=reveals, output=bool(output), logPath=logPath,
+                              history=history is not None, metrics=(metrics.phases, bool(metrics.profilePath)) if metrics else None,
+                              schedule=trace.schedule if trace else None)
+        self.pool = multiprocessing.Pool(self.workers, initializer=initProc, initargs=(self.outputQ, ))
+        if metrics and output:
+            metrics.addQueue("outputQ", self.outputQ.qsize)
+
+    def playBlocks(self, blockList, results, blockDone=None):
+        # The parent only ever holds one tuple per block in flight.
+        if self.writer:
+            blockList = self.admitted(blockList)
+        try:
+            for block, result, packed, stats, snapshots in self.pool.imap_unordered(self.target, blockList):
+                results[0] += result[0]
+                results[1] += result[1]
+                results[2] += result[2]
+
+                # Counters of the process that played the block
+                if stats:
+                    self.addStats(block, stats)
+
+                # Copy the block's packed rounds into their place in the history
+                if self.history is not None:
+                    self.history[block[1] - 1:block[1] - 1 + block[2]] = packed
+
+                if self.trace:
+                    self.trace.add(block, result, snapshots)
+
+                if blockDone:
+                    blockDone(block, result)
+        except KeyboardInterrupt:
+            # The blocks and round output still queued are dropped
+            if self.writer:
+                self.writer.stop()
+            self.pool.terminate()
+            raise
+
+    def admitted(self, blockList):
+        # Blocks as the pool takes them, noting each one's place in the output and holding back
+        # any that would run too far ahead of it
+        for block in blockList:
+            self.writer.admit(self.writer.expect(block))
+            yield block
+
+    def addStats(self, block, stats):
+        processName, phases, profileStats = stats
+        workerStats = self.metrics.worker(processName)
+        workerStats.rounds += block[2]
+        if phases:
+            workerStats.addPhases(phases)
+        if profileStats:
+            self.metrics.addProfile(profileStats)
+
+    def close(self):
+        self.pool.close()
+        self.pool.join()
+
+        # Output the rounds still on the shared queue.
+        if self.writer:
+            self.writer.close()
+
+def runBatch(rng, count, doors, reveals, phases=None):
+    # Play a batch of rounds at once, returns the round arrays
+    # [WinningNumber, ParticipantPick, HostShow, ResultStick, ResultRandom, ResultSwap]
+    # phases, when set, is a dictionary the seconds spent in each phase are added to.
+    import numpy as np
+    startTime = timer() if phases is not None else 0
+    boxType = np.int8 if doors < 128 else np.int32
+    closedOthers = doors - 1 - reveals      # Boxes still closed apart from the participant pick
+
+    # Select the rounds winning box and the participant pick, random choice
+    winning = rng.integers(1, doors + 1, size=count, dtype=boxType)
+    pick = rng.integers(1, doors + 1, size=count, dtype=boxType)
+    correct = winning == pick
+    if phases is not None:
+        rngDone = timer()
+        phases["rng"] += rngDone - startTime
+
+    # Host shows one of the opened boxes, uniform over the boxes that are neither
+    # the winner nor the pick. A smaller range is drawn and stepped past the excluded boxes.
+    low = np.minimum(winning, pick)
+    high = np.maximum(winning, pick)
+    hostShow = rng.integers(1, np.where(correct, doors, doors - 1), dtype=boxType)
+    hostShow += hostShow >= low
+    hostShow += (hostShow >= high) & ~correct
+    if phases is not None:
+        hostDone = timer()
+        phases["host"] += hostDone - rngDone
+
+    # 1st Case Participant Sticks
+    resultStick = correct
+
+    # 3rd Case Participant Swaps to one of the other closed boxes, the winning box
+    # is one of them when the pick was wrong.
+    resultSwap = ~correct & (rng.integers(0, closedOthers, size=count) == 0)
+
+    # 2nd Case Participant Picks Random box from the closed boxes, including the original pick
+    resultRandom = np.where(rng.integers(0, closedOthers + 1, size=count) == 0,
+                            correct,
+                            ~correct & (rng.integers(0, closedOthers, size=count) == 0))
+    if phases is not None:
+        phases["scoring"] += timer() - hostDone
+
+    return winning, pick, hostShow, resultStick, resultRandom, resultSwap
+
+def playBatches(blockList, seed, doors, reveals, result, output=None, logPath=None, history=None, blockDone=None, stopping=None,
+                stats=None):
+    # Play each block as one batch from its own random stream, adding the wins into result.
+    # output, when set, is called with each round. history, when set, is the run's bytearray of packed rounds.
+    # blockDone, when set, is called with each block and its counts, and no more blocks are played once stopping is set.
+    # stats, when set, is the montyhallsim_metrics.WorkerStats of the thread playing the blocks.
+    import numpy as np
+    roundLog = None
+    packedRounds = np.frombuffer(history, dtype=np.uint8) if history is not None else None
+    for block in blockList:
+        if stopping is not None and stopping.is_set():
+            break
+        batchNumber, firstRound, roundCount = block
+        phases = stats.phases if stats else None
+        batch = runBatch(blockGenerator(seed, batchNumber), roundCount, doors, reveals, phases)
+        counts = [int(np.count_nonzero(batch[3])), int(np.count_nonzero(batch[4])), int(np.count_nonzero(batch[5]))]
+        result[0] += counts[0]
+        result[1] += counts[1]
+        result[2] += counts[2]
+        outputStart = timer() if phases is not None else 0
+        if output:
+            outputBatch(firstRound, batch, output)
+        if logPath:
+            if roundLog is None:
+                roundLog = RoundLogWriter(logPath, firstRound)
+            roundLog.writeArrays(firstRound, *batch)
+        if packedRounds is not None:
+            packedRounds[firstRound - 1:firstRound - 1 + roundCount] = encode(batch[0], batch[1], batch[2], batch[4], batch[5])
+        if phases is not None:
+            phases["output"] += timer() - outputStart
+        if stats:
+            stats.rounds += roundCount
+        if blockDone:
+            blockDone(block, counts)
+    if roundLog:
+        roundLog.close()
+
+def outputBatch(firstRound, batch, output):
+    # Pass each round of a batch to output
+    winning, pick, hostShow, resultStick, resultRandom, resultSwap = [column.tolist() for column in batch]
+    for i in range(len(winning)):
+        output([firstRound + i, winning[i], pick[i], hostShow[i], resultStick[i], resultRandom[i], resultSwap[i]])
+
+def requireNumpy(engine):
+    # numpy is only imported by the engines that use it, so the others start without it
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("the " + engine + " engine requires numpy, install it with 'pip install numpy' or use another engine")
+
+class NumpyEngine:
+    # Plays each block as one vectorized batch in the calling thread.
+    blockSize = 1000000
+
+    def __init__(self, seed, doors, reveals, workers=1, output=None, logPath=None, history=None, metrics=None):
+        requireNumpy("numpy")
+        self.seed = seed
+        self.doors = doors
+        self.reveals = reveals
+        self.workers = 1
+        self.output = output
+        self.logPath = logPath
+        self.history = history
+        self.metrics = metrics
+
+    def playBlocks(self, blockList, results, blockDone=None):
+        output = None
+        if self.output:
+            output = lambda round: self.output(round, None)
+        if self.metrics:
+            self.metrics.profile(playBatches, blockList, self.seed, self.doors, self.reveals, results, output, self.logPath, self.history,
+                                 blockDone, None, self.metrics.worker("main"))
+        else:
+            playBatches(blockList, self.seed, self.doors, self.reveals, results, output, self.logPath, self.history, blockDone)
+
+    def close(self):
+        pass
+
+def outcomeCells(doors, reveals):
+    # Probability of each cell of the joint outcome table of a round, the wins it scores are in cellWins.
+    # The pick is right with probability 1/doors. Swap then wins with probability 1/closedOthers when the
+    # pick was wrong, and random wins with probability 1/(closedOthers+1) either way, drawn independently of swap.
+    # Which boxes won, were picked or shown does not change the wins, so they are added into these cells.
+    closedOthers = doors - 1 - reveals
+    right = 1.0 / doors
+    wrong = 1 - right
+    randomWins = 1.0 / (closedOthers + 1)
+    swapWins = 1.0 / closedOthers
+    return [right * randomWins,                                     # Right pick, random wins
+            right * (1 - randomWins),                               # Right pick, random loses
+            wrong * swapWins * randomWins,                          # Wrong pick, swap and random win
+            wrong * swapWins * (1 - randomWins),                    # Wrong pick, swap wins, random loses
+            wrong * (1 - swapWins) * randomWins,                    # Wrong pick, swap loses, random wins
+            wrong * (1 - swapWins) * (1 - randomWins)]              # Wrong pick, swap and random lose
+
+# Wins scored by each outcome cell, [stick, random, swap]
+cellWins = [(1, 1, 0), (1, 0, 0), (0, 1, 1), (0, 0, 1), (0, 1, 0), (0, 0, 0)]
+
+def playCells(blockList, seed, doors, reveals, result, blockDone=None, stats=None):
+    # Draw how many rounds of each block fall in each outcome cell, in one multinomial draw from
+    # the block's own random stream, and add the wins into result. No round is played.
+    probabilities = outcomeCells(doors, reveals)
+    for block in blockList:
+        cells = blockGenerator(seed, block[0]).multinomial(block[2], probabilities).tolist()
+        counts = [sum(cell * wins[i] for cell, wins in zip(cells, cellWins)) for i in range(3)]
+        result[0] += counts[0]
+        result[1] += counts[1]
+        result[2] += counts[2]
+        if stats:
+            stats.rounds += block[2]
+        if blockDone:
+            blockDone(block, counts)
+
+class AggregateEngine:
+    # Draws the win counts of each block straight from the outcome probabilities, in the calling thread.
+    # The counts have the same distribution as playing the rounds, at a cost that does not grow with them.
+    blockSize = 1000000000
+    countsOnly = True
+
+    def __init__(self, seed, doors, reveals, workers=1, output=None, logPath=None, history=None, metrics=None):
+        requireNumpy("aggregate")
+        if output or logPath or history is not None:
+            raise ValueError("the aggregate engine can not output, log or keep the rounds, it does not play them")
+        self.seed = seed
+        self.doors = doors
+        self.reveals = reveals
+        self.workers = 1
+        self.metrics = metrics
+
+    def playBlocks(self, blockList, results, blockDone=None):
+        playCells(blockList, self.seed, self.doors, self.reveals, results, blockDone, self.metrics.worker("main") if self.metrics else None)
+
+    def close(self):
+        pass
+
+def loadJit():
+    # The numba compiled round loop, None when numba is not installed
+    try:
+        import montyhallsim_jit
+    except ImportError:
+        return None
+    return montyhallsim_jit
+
+class JitEngine:
+    # Plays the rounds in a machine code loop compiled by numba, with its own splitmix64 stream per
+    # block. Each call to the kernel plays a few blocks per thread in a parallel range, so the counts
+    # and Ctrl-C are handled between calls. Without numba it falls back to the process pool engine.
+    blockSize = 1000000
+    countsOnly = True
+
+    def __init__(self, seed, doors, reveals, workers=None, output=None, logPath=None, history=None, metrics=None):
+        if output or logPath or history is not None:
+            raise ValueError("the jit engine can not output, log or keep the rounds, it only counts the wins")
+        self.seed = seed
+        self.doors = doors
+        self.reveals = reveals
+        self.metrics = metrics
+        self.kernel = loadJit()
+        self.fallback = None
+        if self.kernel is None:
+            self.fallback = MultiprocEngine(seed, doors, reveals, workers, metrics=metrics)
+            self.workers = self.fallback.workers
+        else:
+            self.workers = workers or multiprocessing.cpu_count()
+            self.kernel.setThreads(self.workers)
+
+    def playBlocks(self, blockList, results, blockDone=None):
+        if self.fallback:
+            self.fallback.playBlocks(blockList, results, blockDone)
+            return
+        pendingBlocks = iter(blockList)
+        while True:
+            batch = list(islice(pendingBlocks, self.workers * 4))
+            if not batch:
+                break
+            for block, result in zip(batch, self.kernel.playBlocks(self.seed, batch, self.doors, self.reveals)):
+                results[0] += result[0]
+                results[1] += result[1]
+                results[2] += result[2]
+                if self.metrics:
+                    self.metrics.worker("jit").rounds += block[2]
+                if blockDone:
+                    blockDone(block, result)
+
+    def close(self):
+        if self.fallback:
+            self.fallback.close()
+
+class NumpyThreadedEngine:
+    # Splits the blocks into one contiguous run per thread. Each thread plays its run as
+    # vectorized batches with its own counts, and the counts are merged once the threads
+    # have finished. numpy releases the GIL while it draws and scores a batch, so the
+    # threads run in parallel without the pickling cost of a process pool. With round output
+    # the threads claim one block at a time instead, so the output never waits on a whole run.
+    blockSize = NumpyEngine.blockSize
+    concurrentOutput = True
+
+    def __init__(self, seed, doors, reveals, workers=None, output=None, logPath=None, history=None, metrics=None,
+                 outputOrder="completed"):
+        requireNumpy("numpy-threaded")
+        self.seed = seed
+        self.doors = doors
+        self.reveals = reveals
+        self.workers = workers or multiprocessing.cpu_count()
+        self.logPath = logPath
+        self.history = history
+        self.metrics = metrics
+        self.claimLock = threading.Lock()           # Each Thread needs to acquire this lock for claiming the next block with output.
+        self.stopping = threading.Event()           # Set on Ctrl-C, the threads stop after their current batch.
+        self.writer = RoundWriter(output, outputOrder, window=self.workers * 2) if output else None
+        if metrics and output:
+            metrics.addQueue("outputQ", self.writer.depth)
+
+    def playBlocks(self, blockList, results, blockDone=None):
+        blockList = list(blockList)
+        runLength = -(-len(blockList) // self.workers)  # Blocks per thread, rounded up
+        pendingBlocks = iter(blockList)                 # Blocks claimed one at a time with output
+
+        # Each thread gets its own run of blocks and its own counts, [stick, random, swap]
+        threadResults = []
+        threads = []
+        for t in range(self.workers):
+            run = blockList[t * runLength:(t + 1) * runLength]
+            if not run:
+                break
+            threadResults.append([0,0,0])
+            if self.writer:
+                target, arguments = self.playClaimed, (pendingBlocks, threadResults[t], blockDone)
+            else:
+                target, arguments = playBatches, (run, self.seed, self.doors, self.reveals, threadResults[t], None, self.logPath, self.history,
+                                                  blockDone, self.stopping)
+            if self.metrics:
+                newThread = threading.Thread(target=self.metrics.profile, name="t"+str(t),
+                                             args=(target, ) + arguments + (self.metrics.worker("t"+str(t)), ))
+            else:
+                newThread = threading.Thread(target=target, name="t"+str(t), args=arguments)
+            threads.append(newThread)
+
+        for t in threads:
+            t.start()
+
+        try:
+            joinThreads(threads, self.stopping)
+        except KeyboardInterrupt:
+            if self.writer:
+                self.writer.stop()
+            raise
+
+        # Single merge of the thread counts
+        for result in threadResults:
+            results[0] += result[0]
+            results[1] += result[1]
+            results[2] += result[2]
+
+    def playClaimed(self, pendingBlocks, result, blockDone, stats=None):
+        # Claim and play blocks one at a time, passing their rounds to the writer
+        collector = self.writer.collector(threading.current_thread().name)
+        while not self.stopping.is_set():
+            with self.claimLock:
+                block = next(pendingBlocks, None)
+                if block is None:
+                    break
+                sequence = self.writer.expect(block)
+            self.writer.admit(sequence)
+            playBatches([block], self.seed, self.doors, self.reveals, result, collector, self.logPath, self.history, blockDone,
+                        self.stopping, stats)
+            collector.flush()
+
+    def close(self):
+        if self.writer:
+            self.writer.close()
+
+def sendMessage(connection, message):
+    # Messages between the coordinator and workers are JSON, one object per line
+    connection.sendall((json.dumps(message) + "\n").encode())
+
+def initWorkerProc():
+    # Ctrl-C is handled by the worker process, which stops its pool
+    global workerParent     # Process id of the worker process
+    workerParent = os.getppid()
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+def workerBlock(*arguments):
+    # Pool task of a distributed worker, processBlock in a pool process that leaves quietly once the worker
+    # process has gone, rather than failing to send the result back to it.
+    outcome = processBlock(*arguments)
+    if os.getppid() != workerParent:
+        os._exit(0)
+    return outcome
+
+def runDistributedWorker(address, procs=None, once=False, retryDelay=1.0, stopping=None):
+    # Worker for the distributed engine. Connects to the coordinator at address, (Host, Port), and plays the
+    # blocks it is sent on a pool of procs processes, keeping two blocks per process in hand. When the
+    # coordinator finishes a run it reconnects for the next, unless once is set, until stopping is set.
+    procs = procs or multiprocessing.cpu_count()
+    workerName = socket.gethostname() + ":" + str(os.getpid())
+    pool = multiprocessing.Pool(procs, initializer=initWorkerProc)
+    try:
+        while not (stopping is not None and stopping.is_set()):
+            try:
+                connection = socket.create_connection(address)
+            except OSError:
+                if once:
+                    return
+                time.sleep(retryDelay)
+                continue
+            with connection:
+                try:
+                    playDistributedBlocks(connection, pool, workerName, procs * 2)
+                except OSError:
+                    pass                    # The coordinator has gone, the blocks in hand are played elsewhere
+            if once:
+                return
+    finally:
+        pool.terminate()
+        pool.join()
+
+def playDistributedBlocks(connection, pool, workerName, slots):
+    # Play the blocks sent over one connection, until the coordinator closes it
+    sendLock = threading.Lock()             # Results are sent from the pool's result thread
+
+    def sendResult(outcome):
+        block, result, packed, stats, snapshots = outcome
+        with sendLock:
+            try:
+                sendMessage(connection, {"block": list(block), "results": list(result)})
+            except OSError:
+                pass                        # The coordinator has gone, it plays the block again elsewhere
+
+    def sendError(block, error):
+        # A block that failed is reported at once, so the coordinator does not wait out its timeout for it
+        with sendLock:
+            try:
+                sendMessage(connection, {"block": list(block), "error": type(error).__name__ + ": " + str(error)})
+            except OSError:
+                pass
+
+    sendMessage(connection, {"worker": workerName, "slots": slots})
+    lines = connection.makefile("rb")
+    settings = None
+    for line in lines:
+        message = json.loads(line)
+        if settings is None:
+            settings = message
+            continue
+        block = tuple(message["block"])
+        pool.apply_async(workerBlock, (block, settings["seed"], settings["doors"], settings["reveals"], False),
+                         callback=sendResult, error_callback=partial(sendError, block))
+
+def runLocalWorker(address):
+    # Loopback worker of one process for a single run, Ctrl-C is handled by the coordinator
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    runDistributedWorker(address, 1, once=True)
+
+class DistributedEngine:
+    # Coordinator of a run played by workers over TCP. Workers connect to address, and each is kept
+    # busy with as many blocks as it asks for. The blocks of a worker that disconnects, or sends
+    # nothing for blockTimeout seconds, are handed to the other workers again. Each block draws from
+    # its own stream of the seed, so the counts match a single machine run with the same seed.
+    # workers starts that many workers on this machine, connected over the loopback interface.
+    blockSize = defaultBlockSize
+    blockTimeout = 600.0
+    countsOnly = True
+
+    def __init__(self, seed, doors, reveals, workers=None, output=None, logPath=None, history=None, metrics=None,
+                 address=("127.0.0.1", 0)):
+        if output or logPath or history is not None:
+            raise ValueError("the distributed engine can not output, log or keep the rounds, they are played on the workers")
+        self.seed = seed
+        self.doors = doors
+        self.reveals = reveals
+        self.metrics = metrics
+        self.workers = 0                    # Workers that have connected
+        self.condition = threading.Condition()  # Guards the blocks and counts, and wakes playBlocks and the connections
+        self.pendingBlocks = iter(())
+        self.retryBlocks = deque()          # Blocks of workers that were lost, played before any new ones
+        self.outstanding = 0                # Blocks sent and not yet counted
+        self.closing = False
+        self.error = None                   # Error a worker reported for a block, raised by playBlocks
+        self.connections = []
+
+        self.listener = socket.create_server(address)
+        self.address = self.listener.getsockname()[:2]
+        threading.Thread(target=self.acceptWorkers, name="coordinator", daemon=True).start()
+
+        # Loopback workers
+        self.localWorkers = []
+        for w in range(workers or 0):
+            localWorker = multiprocessing.Process(target=runLocalWorker, args=(("127.0.0.1", self.address[1]), ), name="w"+str(w))
+            localWorker.start()
+            self.localWorkers.append(localWorker)
+
+    def acceptWorkers(self):
+        while True:
+            try:
+                connection, peer = self.listener.accept()
+            except OSError:
+                break                       # Listener closed
+            with self.condition:
+                if self.closing:
+                    connection.close()
+                    break
+                self.connections.append(connection)
+                self.workers += 1
+            threading.Thread(target=self.serveWorker, args=(connection, ), name="worker"+str(self.workers), daemon=True).start()
+
+    def playBlocks(self, blockList, results, blockDone=None):
+        pendingBlocks = iter(blockList)
+        firstBlock = next(pendingBlocks, None)
+        if firstBlock is None:
+            return
+        with self.condition:
+            self.pendingBlocks = chain([firstBlock], pendingBlocks)
+            self.results = results
+            self.blockDone = blockDone
+            self.finished = False
+            self.condition.notify_all()
+            # The timeout keeps the wait open to Ctrl-C
+            while not self.finished:
+                self.condition.wait(0.5)
+                if self.error is not None:
+                    raise self.error
+                self.finished = self.outstanding == 0 and not self.retryBlocks and self.pendingBlocks is None
+
+    def nextBlock(self):
+        # Next block to hand out, called holding the condition. None when there are none left.
+        if self.retryBlocks:
+            return self.retryBlocks.popleft()
+        if self.pendingBlocks is not None:
+            block = next(self.pendingBlocks, None)
+            if block is not None:
+                return block
+            self.pendingBlocks = None
+        return None
+
+    def serveWorker(self, connection):
+        # Keep a worker supplied with blocks and count the results it sends back
+        inHand = {}                         # Blocks sent to the worker, by block number
+        try:
+            connection.settimeout(self.blockTimeout)
+            lines = connection.makefile("rb")
+            hello = json.loads(lines.readline())
+            workerName, slots = hello["worker"], max(int(hello["slots"]), 1)
+            sendMessage(connection, {"seed": self.seed, "doors": self.doors, "reveals": self.reveals})
+            while True:
+                sending = []
+                with self.condition:
+                    while len(inHand) < slots:
+                        block = self.nextBlock()
+                        if block is None:
+                            break
+                        inHand[block[0]] = block
+                        self.outstanding += 1
+                        sending.append(block)
+                    if not inHand:
+                        if self.closing:
+                            break
+                        self.condition.wait(0.5)
+                        continue
+                for block in sending:
+                    sendMessage(connection, {"block": list(block)})
+
+                line = lines.readline()
+                if not line:
+                    break                   # Worker disconnected
+                message = json.loads(line)
+                block = inHand.pop(message["block"][0])
+                if "error" in message:
+                    # Every block of a seed plays the same on any worker, so the run fails rather than retrying it
+                    with self.condition:
+                        self.outstanding -= 1
+                        self.error = RuntimeError("worker " + workerName + " failed to play block " + str(block[0]) + ", " + message["error"])
+                        self.condition.notify_all()
+                    continue
+                result = message["results"]
+                with self.condition:
+                    self.results[0] += result[0]
+                    self.results[1] += result[1]
+                    self.results[2] += result[2]
+                    self.outstanding -= 1
+                    if self.metrics:
+                        self.metrics.worker(workerName).rounds += block[2]
+                    if self.blockDone:
+                        self.blockDone(block, result)
+                    self.condition.notify_all()
+        except (OSError, ValueError, KeyError):
+            pass                            # Lost the worker, timed out or sent something unreadable
+        finally:
+            connection.close()
+            with self.condition:
+                # Hand the blocks the worker had to the others
+                self.retryBlocks.extend(inHand.values())
+                self.outstanding -= len(inHand)
+                self.condition.notify_all()
+
+    def close(self):
+        with self.condition:
+            self.closing = True
+            self.condition.notify_all()
+        self.listener.close()
+        for connection in list(self.connections):
+            try:
+                connection.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        for localWorker in self.localWorkers:
+            localWorker.join()
+
+# Engines by name
+engines = {
+    "single": SingleEngine,
+    "threaded": ThreadedEngine,
+    "multiproc": MultiprocEngine,
+    "numpy": NumpyEngine,
+    "numpy-threaded": NumpyThreadedEngine,
+    "distributed": DistributedEngine,
+    "aggregate": AggregateEngine,
+    "jit": JitEngine,
+}
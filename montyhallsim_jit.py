@@ -0,0 +1,99 @@
+# Monty Hall Simulator - JIT Kernel
+#######################################
+# Author: Dave Auld
+# Version: 1.0
+# Date: 18th October 2026
+# Description: Round loop compiled to
+# machine code by numba, for the jit
+# engine. Each block draws from its own
+# splitmix64 stream derived from the
+# seed, and the blocks are spread over
+# the cores with a parallel range, so a
+# seeded run gives the same counts with
+# any number of threads. Importing this
+# module raises ImportError when numba
+# is not installed.
+#
+# License: MIT
+#######################################
+
+import numba                                # used to compile the round loop
+import numpy as np                          # used for the block and count arrays
+
+# splitmix64 constants
+golden = np.uint64(0x9E3779B97F4A7C15)
+blockStep = np.uint64(0xD1B54A32D192ED03)
+mask32 = np.uint64(0xFFFFFFFF)
+range32 = np.uint64(0x100000000)
+
+@numba.njit(cache=True)
+def mix(z):
+    # splitmix64 output function, spreads the bits of z over the whole word
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
+
+@numba.njit(cache=True)
+def below(state, n):
+    # Uniform integer from 0 to n-1, returns (State, Value). The top 32 bits of the next draw are
+    # multiplied by n and the draws that would favour some values are rejected, so there is no bias.
+    n = np.uint64(n)
+    threshold = (range32 - n) % n
+    while True:
+        state = state + golden
+        product = (mix(state) >> np.uint64(32)) * n
+        if (product & mask32) >= threshold:
+            return state, product >> np.uint64(32)
+
+@numba.njit(cache=True)
+def playBlock(state, roundCount, doors, reveals):
+    # Play roundCount rounds, returns (stick, random, swap). The host's box does not change the wins,
+    # so it is not drawn, the rest follows montyhallsim_core.playRound.
+    closedOthers = doors - 1 - reveals
+    stick = 0
+    random = 0
+    swap = 0
+    for r in range(roundCount):
+        state, winning = below(state, doors)
+        state, pick = below(state, doors)
+        correct = winning == pick
+        if correct:
+            stick += 1
+        else:
+            if closedOthers == 1:
+                swap += 1
+            else:
+                state, box = below(state, closedOthers)
+                if box == 0:
+                    swap += 1
+        state, box = below(state, closedOthers + 1)
+        if box == 0:
+            if correct:
+                random += 1
+        elif not correct:
+            if closedOthers == 1:
+                random += 1
+            else:
+                state, box = below(state, closedOthers)
+                if box == 0:
+                    random += 1
+    return stick, random, swap
+
+@numba.njit(parallel=True, cache=True)
+def playKernel(seed, blockNumbers, roundCounts, doors, reveals, counts):
+    # Play each block from its own stream into its row of counts, the blocks are shared between the threads
+    seedState = mix(seed)
+    for i in numba.prange(len(blockNumbers)):
+        state = mix(seedState + (blockNumbers[i] + np.uint64(1)) * blockStep)
+        counts[i, 0], counts[i, 1], counts[i, 2] = playBlock(state, roundCounts[i], doors, reveals)
+
+def setThreads(threads):
+    # Threads the parallel range uses, at most the number numba started with
+    numba.set_num_threads(max(1, min(threads, numba.config.NUMBA_NUM_THREADS)))
+
+def playBlocks(seed, blockList, doors, reveals):
+    # Play the (BlockNumber, FirstRound, RoundCount) blocks, returns a [stick, random, swap] list for each
+    counts = np.zeros((len(blockList), 3), dtype=np.int64)
+    playKernel(np.uint64(seed % (1 << 64)), np.array([block[0] for block in blockList], dtype=np.uint64),
+               np.array([block[2] for block in blockList], dtype=np.int64), doors, reveals, counts)
+    return counts.tolist()
@@ -0,0 +1,189 @@
+# Monty Hall Simulator - Live Metrics
+#######################################
+# Author: Dave Auld
+# Version: 1.0
+# Date: 18th October 2026
+# Description: Optional instrumentation
+# of a running simulation. Reports the
+# rounds/sec overall and for each worker,
+# queue depths, time spent waiting on
+# the engine locks, and optionally a
+# breakdown of the round phases and a
+# cProfile of the hot path, every
+# interval seconds to stderr or a file.
+# Engines given no Metrics only check
+# for it once per block.
+#
+# License: MIT
+#######################################
+
+import cProfile                             # used for the opt-in profile of the hot path
+import pstats                               # used to merge and save the profiles
+import sys                                  # used for the default report stream
+import threading                            # used for the report thread
+from timeit import default_timer as timer   # used for the report times.
+
+# Round phases timed when phases are on. rng is the winning box and pick, host the host reveal,
+# scoring the participant's 2nd choice and the win counts, output the round output, log and history.
+phaseNames = ["rng", "host", "scoring", "output"]
+
+class WorkerStats:
+    # Counters of one thread or process. Only that worker updates them, so they need no lock,
+    # the report thread just reads them.
+
+    def __init__(self, phases):
+        self.rounds = 0
+        self.lockWait = {}                  # Seconds waiting by lock name
+        self.phases = dict.fromkeys(phaseNames, 0.0) if phases else None
+
+    def addLockWait(self, name, seconds):
+        self.lockWait[name] = self.lockWait.get(name, 0.0) + seconds
+
+    def addPhases(self, phases):
+        for name, seconds in phases.items():
+            self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+class ProfileData:
+    # Raw cProfile stats passed back from a pool process, in the form pstats.Stats reads.
+
+    def __init__(self, stats):
+        self.stats = stats
+
+    def create_stats(self):
+        pass
+
+def profileCall(function, *args):
+    # Call function under cProfile, returns [Value, Raw Stats]
+    profile = cProfile.Profile()
+    profile.enable()
+    try:
+        value = function(*args)
+    finally:
+        profile.disable()
+    profile.create_stats()
+    return value, profile.stats
+
+class Metrics:
+    # Live instrumentation, pass to simulate(metrics=...). Every interval seconds a line is written to stream,
+    # stderr by default. phases times each phase of every round, which slows the rounds down, and
+    # profilePath saves a cProfile of the blocks played, read it with "python -m pstats PROFILEPATH".
+
+    def __init__(self, interval=1.0, stream=None, phases=False, profilePath=None):
+        self.interval = interval
+        self.stream = stream or sys.stderr
+        self.phases = phases
+        self.profilePath = profilePath
+        self.workers = {}                   # WorkerStats by worker name
+        self.queues = {}                    # Function returning the queue depth, by queue name
+        self.lock = threading.Lock()        # Guards adding workers and profiles
+        self.profileStats = None
+        self.stopping = threading.Event()
+        self.reporter = None
+
+    def worker(self, name):
+        # The counters of a worker, added the first time it is seen
+        stats = self.workers.get(name)
+        if stats is None:
+            with self.lock:
+                stats = self.workers.setdefault(name, WorkerStats(self.phases))
+        return stats
+
+    def addQueue(self, name, depth):
+        self.queues[name] = depth
+
+    def timedAcquire(self, lock, name, stats):
+        # Acquire lock, adding the time spent waiting for it to the worker's counters
+        startTime = timer()
+        lock.acquire()
+        stats.addLockWait(name, timer() - startTime)
+
+    def profile(self, function, *args):
+        # Call function, under cProfile when a profile was asked for
+        if not self.profilePath:
+            return function(*args)
+        value, stats = profileCall(function, *args)
+        self.addProfile(stats)
+        return value
+
+    def addProfile(self, stats):
+        with self.lock:
+            if self.profileStats is None:
+                self.profileStats = pstats.Stats(ProfileData(stats))
+            else:
+                self.profileStats.add(ProfileData(stats))
+
+    def start(self):
+        # Start reporting every interval seconds
+        self.startTime = timer()
+        self.lastTime = self.startTime
+        self.lastRounds = {}
+        self.stopping.clear()
+        self.reporter = threading.Thread(target=self.reportLoop, name="metrics", daemon=True)
+        self.reporter.start()
+
+    def stop(self):
+        # Stop reporting, write the final report line and save the profile
+        self.stopping.set()
+        if self.reporter:
+            self.reporter.join()
+        self.report(final=True)
+        if self.profilePath and self.profileStats is not None:
+            self.profileStats.dump_stats(self.profilePath)
+
+    def reportLoop(self):
+        while not self.stopping.wait(self.interval):
+            self.report()
+
+    def report(self, final=False):
+        # Write one line, rates are over the time since the last line, or the whole run for the final line
+        now = timer()
+        if final:
+            elapsed = now - self.startTime
+            lastRounds = {}
+        else:
+            elapsed = now - self.lastTime
+            lastRounds = self.lastRounds
+        workers = sorted(self.workers.items())
+        rounds = sum(stats.rounds for name, stats in workers)
+        line = ("metrics" + (" final" if final else "") + " t=" + format(now - self.startTime, ".1f") + "s rounds=" + str(rounds)
+                + " rate=" + rate(rounds - sum(lastRounds.values()), elapsed) + "/s")
+
+        line += " workers"
+        for name, stats in workers:
+            line += " " + name + "=" + rate(stats.rounds - lastRounds.get(name, 0), elapsed) + "/s"
+
+        if self.queues:
+            line += " queue"
+            for name, depth in sorted(self.queues.items()):
+                try:
+                    line += " " + name + "=" + str(depth())
+                except NotImplementedError:     # Queue sizes are not available on macOS
+                    line += " " + name + "=n/a"
+
+        lockWait = totals([stats.lockWait for name, stats in workers])
+        if lockWait:
+            line += " locks"
+            for name, seconds in sorted(lockWait.items()):
+                line += " " + name + "=" + format(seconds, ".3f") + "s"
+
+        if self.phases:
+            phases = totals([stats.phases for name, stats in workers])
+            line += " phases"
+            for name in phaseNames:
+                line += " " + name + "=" + format(phases.get(name, 0.0), ".3f") + "s"
+
+        self.stream.write(line + "\n")
+        self.stream.flush()
+        self.lastTime = now
+        self.lastRounds = dict((name, stats.rounds) for name, stats in workers)
+
+def rate(rounds, seconds):
+    return str(int(rounds / seconds)) if seconds > 0 else "0"
+
+def totals(counters):
+    # Add up dictionaries of seconds by name
+    total = {}
+    for counter in counters:
+        for name, seconds in list(counter.items()):
+            total[name] = total.get(name, 0.0) + seconds
+    return total
@@ -0,0 +1,42 @@
+# Monty Hall Simulator - NumPy Vectorized
+#######################################
+# Author: Dave Auld
+# Version: 1.4
+# Date: 18th October 2026
+# Description: Monty Hall Simulation
+# using NumPy to play rounds in large
+# batches as integer arrays instead of
+# one Python call chain per round. Each
+# batch draws from its own random stream
+# derived from the master seed. With
+# --aggregate the win counts are drawn
+# directly without playing the rounds.
+# Command line wrapper around
+# montyhallsim_api.simulate.
+#
+# License: MIT
+#######################################
+
+from montyhallsim_cli import buildParser, run  # shared command line handling
+from montyhallsim_engines import NumpyEngine, AggregateEngine  # used for the default batch and block sizes
+
+def main():
+    parser = buildParser(NumpyEngine.blockSize, blockHelp="Set the number of rounds played per batch and random stream block.")
+    parser.add_argument("-a", "--aggregate", action="store_true", help="Draw the win counts straight from the outcome probabilities without playing the rounds. Default is off.")
+
+    engine = {}                             # Engine picked from the arguments, for the banner
+
+    def pickEngine(args):
+        engine["name"] = "aggregate" if args.aggregate else "numpy"
+        return engine["name"]
+
+    def banner(settings):
+        if engine["name"] == "aggregate":
+            print("Aggregate counts, block size: " + str(settings.get("blockSize", AggregateEngine.blockSize)))
+        else:
+            print("Batch size: " + str(settings.get("blockSize", NumpyEngine.blockSize)))
+
+    run(parser, pickEngine, banner)
+
+if __name__ == "__main__":
+    main()
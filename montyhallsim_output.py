@@ -0,0 +1,164 @@
+# Monty Hall Simulator - Round Output
+#######################################
+# Author: Dave Auld
+# Version: 1.0
+# Date: 18th October 2026
+# Description: Writer stage for the
+# round output of the threaded and
+# process pool engines. Workers collect
+# their rounds into batches and put them
+# on a bounded queue, and a writer
+# thread passes them to the output
+# while the workers play on. A full
+# queue holds the workers up until the
+# writer catches up. The rounds are
+# output as the batches complete, or in
+# round number order.
+#
+# License: MIT
+#######################################
+
+import queue                                # bounded queue between the worker threads and the writer
+import threading                            # used for the writer thread
+from collections import deque               # blocks in the order their rounds are output
+
+# Output orders
+outputOrders = ["completed", "round"]
+
+# Default batches the queue holds, and rounds per batch
+defaultBufferBatches = 64
+defaultBatchRounds = 1000
+
+class BatchCollector:
+    # Collects one worker's rounds into batches of consecutive rounds, passing each full batch to put
+    # as (FirstRound, Rounds, WorkerName). Call it with each round, and flush() once a block is played.
+
+    def __init__(self, put, workerName, batchRounds=defaultBatchRounds):
+        self.put = put
+        self.workerName = workerName
+        self.batchRounds = batchRounds
+        self.rounds = []
+
+    def __call__(self, round):
+        if self.rounds and round[0] != self.rounds[-1][0] + 1:
+            self.flush()
+        self.rounds.append(round)
+        if len(self.rounds) >= self.batchRounds:
+            self.flush()
+
+    def flush(self):
+        if self.rounds:
+            self.put((self.rounds[0][0], self.rounds, self.workerName))
+            self.rounds = []
+
+class RoundWriter:
+    # Passes batches of rounds to output(round, workerName) on its own thread. batches is the bounded
+    # queue the workers put to, a queue.Queue of bufferBatches by default, or a multiprocessing.Queue
+    # for pool processes. In round order each block must be passed to expect() in the order the
+    # blocks are output, and admit() holds a worker back from starting a block more than window
+    # blocks ahead of the output, so the batches waiting for their turn stay bounded as well.
+
+    def __init__(self, output, order="completed", batches=None, bufferBatches=defaultBufferBatches, window=8):
+        if order not in outputOrders:
+            raise ValueError("unknown output order " + repr(order) + ", expected one of " + ", ".join(outputOrders))
+        self.output = output
+        self.order = order
+        self.batches = batches if batches is not None else queue.Queue(bufferBatches)
+        self.window = window
+        self.expected = deque()             # Blocks not yet fully output, round order only
+        self.expectedCount = 0              # Blocks passed to expect()
+        self.outputCount = 0                # Blocks fully output
+        self.waiting = {}                   # Batches waiting for their turn by first round, round order only
+        self.nextRound = None
+        self.condition = threading.Condition()  # Wakes workers waiting in admit()
+        self.stopping = False
+        self.error = None
+        self.writer = threading.Thread(target=self.writeBatches, name="writer", daemon=True)
+        self.writer.start()
+
+    def collector(self, workerName, batchRounds=defaultBatchRounds):
+        # Output function for a worker thread, call its flush() once each block is played
+        return BatchCollector(self.batches.put, workerName, batchRounds)
+
+    def depth(self):
+        return self.batches.qsize()
+
+    def expect(self, block):
+        # Note the next block in round order, returns its sequence number for admit()
+        with self.condition:
+            sequence = self.expectedCount
+            self.expectedCount += 1
+            if self.order == "round":
+                self.expected.append(block)
+            return sequence
+
+    def admit(self, sequence):
+        # Wait until the block with this sequence number is within the window of the output, round order only
+        if self.order != "round":
+            return
+        with self.condition:
+            while not self.stopping and self.error is None and sequence >= self.outputCount + self.window:
+                self.condition.wait(0.5)
+
+    def writeBatches(self):
+        while True:
+            try:
+                batch = self.batches.get(timeout=0.1)
+            except queue.Empty:
+                if self.stopping:
+                    break
+                continue
+            if batch is None or self.stopping:
+                break
+            if self.error is not None:
+                continue                    # Keep draining so no worker is held up
+            try:
+                if self.order == "round":
+                    self.waiting[batch[0]] = batch
+                    self.writeWaiting()
+                else:
+                    self.writeBatch(batch)
+            except Exception as e:
+                with self.condition:
+                    self.error = e
+                    self.condition.notify_all()
+
+    def writeBatch(self, batch):
+        firstRound, rounds, workerName = batch
+        for round in rounds:
+            self.output(round, workerName)
+
+    def writeWaiting(self):
+        # Output the waiting batches that are next in round order
+        while True:
+            with self.condition:
+                while self.expected:
+                    block = self.expected[0]
+                    if self.nextRound is None or self.nextRound < block[1]:
+                        self.nextRound = block[1]
+                    if self.nextRound < block[1] + block[2]:
+                        break
+                    self.expected.popleft()
+                    self.outputCount += 1
+                    self.condition.notify_all()
+            if self.nextRound not in self.waiting:
+                return
+            batch = self.waiting.pop(self.nextRound)
+            self.writeBatch(batch)
+            self.nextRound += len(batch[1])
+
+    def close(self):
+        # Output everything queued so far and stop the writer, raises any error from the output
+        if self.stopping:
+            return
+        self.batches.put(None)
+        self.writer.join()
+        if self.error is not None:
+            raise self.error
+
+    def stop(self):
+        # Stop at once on Ctrl-C, the rounds still queued are dropped
+        with self.condition:
+            self.stopping = True
+            self.condition.notify_all()
+        self.writer.join(1.0)
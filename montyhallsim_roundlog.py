@@ -0,0 +1,233 @@
+# Monty Hall Simulator - Binary Round Log
+#######################################
+# Author: Dave Auld
+# Version: 1.0
+# Date: 18th October 2026
+# Description: Compact binary log of
+# the individual rounds. Every round is
+# packed into a fixed width slot, so a
+# block of rounds can be written at its
+# own offset from any thread or process
+# and the log can be memory-mapped and
+# replayed without parsing text.
+#
+# License: MIT
+#######################################
+
+import argparse                             # argparse added to support command line parameter functionality
+import mmap                                 # used to map the log for reading
+import os                                   # used for positional writes
+import struct                               # used to pack the header and records
+
+# Log header, [Magic, Version, RecordSize, Doors, NumberOfRounds]
+headerFormat = struct.Struct("<4sHHIQ")
+magic = b"MHRL"
+version = 1
+
+# Result flags packed into the last byte of a record
+stickFlag = 1
+randomFlag = 2
+swapFlag = 4
+
+# Default number of rounds buffered by a writer before each write to disk
+defaultBufferRounds = 65536
+
+def recordStruct(doors):
+    # Record layout, [RoundNumber, WinningNumber, ParticipantPick, HostShow, ResultFlags].
+    # Box numbers use the smallest unsigned integer that holds the door count.
+    if doors < 256:
+        boxFormat = "B"
+    elif doors < 65536:
+        boxFormat = "H"
+    else:
+        boxFormat = "I"
+    return struct.Struct("<Q" + boxFormat * 3 + "B")
+
+def recordDtype(doors):
+    # NumPy equivalent of recordStruct, used for bulk reads and writes
+    import numpy as np
+    boxType = {1: "<u1", 2: "<u2", 4: "<u4"}[(recordStruct(doors).size - 9) // 3]
+    return np.dtype([("round", "<u8"), ("winning", boxType), ("pick", boxType), ("host", boxType), ("result", "u1")])
+
+def createLog(path, numberOfRounds, doors=3):
+    # Create the log with its header and a slot for every round, writers then fill the slots in any order.
+    record = recordStruct(doors)
+    with open(path, "wb") as logFile:
+        logFile.write(headerFormat.pack(magic, version, record.size, doors, numberOfRounds))
+        logFile.truncate(headerFormat.size + record.size * numberOfRounds)
+
+def finishLog(path, numberOfRounds):
+    # Cut the log down to the rounds actually played, for runs that stop before filling every slot.
+    with open(path, "r+b") as logFile:
+        doors, slots = readHeader(logFile)
+        logFile.seek(0)
+        logFile.write(headerFormat.pack(magic, version, recordStruct(doors).size, doors, numberOfRounds))
+        logFile.truncate(headerFormat.size + recordStruct(doors).size * numberOfRounds)
+
+def readHeader(logFile):
+    # Read and check the header, returns [Doors, NumberOfRounds]
+    data = logFile.read(headerFormat.size)
+    if len(data) < headerFormat.size:
+        raise ValueError("not a round log, file is too short")
+    fileMagic, fileVersion, recordSize, doors, numberOfRounds = headerFormat.unpack(data)
+    if fileMagic != magic:
+        raise ValueError("not a round log, bad magic " + repr(fileMagic))
+    if fileVersion != version:
+        raise ValueError("unsupported round log version " + str(fileVersion))
+    if recordSize != recordStruct(doors).size:
+        raise ValueError("round log record size does not match its door count")
+    return doors, numberOfRounds
+
+class RoundLogWriter:
+    # Writes a contiguous run of rounds starting at firstRound, buffering
+    # bufferRounds records in memory between writes to disk.
+
+    def __init__(self, path, firstRound, bufferRounds=defaultBufferRounds):
+        self.fd = os.open(path, os.O_RDWR)
+        with open(path, "rb") as logFile:
+            doors, self.numberOfRounds = readHeader(logFile)
+        self.record = recordStruct(doors)
+        self.doors = doors
+        self.nextRound = firstRound             # Round number of the first record in the buffer
+        self.buffer = bytearray(self.record.size * bufferRounds)
+        self.bufferRounds = bufferRounds
+        self.count = 0                          # Records currently held in the buffer
+
+    def write(self, round):
+        # Pack a round, [RoundNumber, WinningNumber, ParticipantPick, HostShow, ResultStick, ResultRandom, ResultSwap]
+        flags = (stickFlag if round[4] else 0) | (randomFlag if round[5] else 0) | (swapFlag if round[6] else 0)
+        self.record.pack_into(self.buffer, self.count * self.record.size, round[0], round[1], round[2], round[3], flags)
+        self.count += 1
+        if self.count == self.bufferRounds:
+            self.flush()
+
+    def writeArrays(self, firstRound, winning, pick, hostShow, resultStick, resultRandom, resultSwap):
+        # Write a batch of rounds held as numpy arrays straight to disk, starting at firstRound.
+        import numpy as np
+        self.flush()
+        records = np.empty(len(winning), dtype=recordDtype(self.doors))
+        records["round"] = np.arange(firstRound, firstRound + len(winning), dtype=np.uint64)
+        records["winning"] = winning
+        records["pick"] = pick
+        records["host"] = hostShow
+        records["result"] = resultStick * stickFlag | resultRandom * randomFlag | resultSwap * swapFlag
+        self.writeAt(firstRound, records.tobytes())
+        self.nextRound = firstRound + len(winning)
+
+    def flush(self):
+        # Write the buffered records into their slots
+        if self.count:
+            self.writeAt(self.nextRound, memoryview(self.buffer)[:self.count * self.record.size])
+            self.nextRound += self.count
+            self.count = 0
+
+    def writeAt(self, firstRound, data):
+        if firstRound < 1 or firstRound - 1 + len(data) // self.record.size > self.numberOfRounds:
+            raise ValueError("rounds " + str(firstRound) + " onwards do not fit in the round log")
+        offset = headerFormat.size + (firstRound - 1) * self.record.size
+        while data:
+            written = os.pwrite(self.fd, data, offset)
+            data = data[written:]
+            offset += written
+
+    def close(self):
+        self.flush()
+        os.close(self.fd)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class RoundLogReader:
+    # Memory-maps a round log for reading, rounds are numbered from 1.
+
+    def __init__(self, path):
+        with open(path, "rb") as logFile:
+            self.doors, self.numberOfRounds = readHeader(logFile)
+            self.record = recordStruct(self.doors)
+            self.map = mmap.mmap(logFile.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __len__(self):
+        return self.numberOfRounds
+
+    def round(self, roundNumber):
+        # Unpack one round, [RoundNumber, WinningNumber, ParticipantPick, HostShow, ResultStick, ResultRandom, ResultSwap]
+        if roundNumber < 1 or roundNumber > self.numberOfRounds:
+            raise IndexError("round " + str(roundNumber) + " is not in the log")
+        return self.unpack(self.record.unpack_from(self.map, headerFormat.size + (roundNumber - 1) * self.record.size))
+
+    def replay(self, firstRound=1, lastRound=None):
+        # Generate the rounds firstRound to lastRound inclusive, in round order
+        data = self.slice(firstRound, lastRound)
+        for values in self.record.iter_unpack(data):
+            yield self.unpack(values)
+
+    def results(self, firstRound=1, lastRound=None):
+        # Count the wins for each strategy, stick, random, swap, over firstRound to lastRound inclusive
+        data = self.slice(firstRound, lastRound)
+        try:
+            import numpy as np
+        except ImportError:
+            np = None
+        if np is not None:
+            flags = np.frombuffer(data, dtype=recordDtype(self.doors))["result"]
+            return [int(np.count_nonzero(flags & stickFlag)), int(np.count_nonzero(flags & randomFlag)), int(np.count_nonzero(flags & swapFlag))]
+        results = [0,0,0]
+        for values in self.record.iter_unpack(data):
+            flags = values[4]
+            results[0] += flags & stickFlag
+            results[1] += (flags & randomFlag) >> 1
+            results[2] += (flags & swapFlag) >> 2
+        return results
+
+    def slice(self, firstRound, lastRound):
+        if lastRound is None:
+            lastRound = self.numberOfRounds
+        firstRound = max(firstRound, 1)
+        lastRound = min(lastRound, self.numberOfRounds)
+        start = headerFormat.size + (firstRound - 1) * self.record.size
+        return memoryview(self.map)[start:start + max(lastRound - firstRound + 1, 0) * self.record.size]
+
+    def unpack(self, values):
+        roundNumber, winning, pick, hostShow, flags = values
+        return [roundNumber, winning, pick, hostShow, bool(flags & stickFlag), bool(flags & randomFlag), bool(flags & swapFlag)]
+
+    def close(self):
+        self.map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+if __name__ == "__main__":
+
+    # Setup the argparse
+    parser = argparse.ArgumentParser(prog="montyhallsim_roundlog",
+                                    description='''Read a binary round log written with --log. Recomputes the number of wins
+                                            for the different methods (stick/random/swap), or replays a range of rounds.''')
+    parser.add_argument("log", help="Round log file.")
+    parser.add_argument("-f", "--first", type=int, default=1, help="First round to include. Integer. Default is 1.")
+    parser.add_argument("-l", "--last", type=int, default=None, help="Last round to include. Integer. Default is the last round in the log.")
+    parser.add_argument("-o", "--output", action="store_true", help="Replay the individual round output. Default is hidden.")
+    args = parser.parse_args()
+
+    with RoundLogReader(args.log) as log:
+        lastRound = min(args.last or log.numberOfRounds, log.numberOfRounds)
+        numberOfRounds = max(lastRound - args.first + 1, 0)
+        print("Monty Hall Round Log, " + str(log.doors) + " boxes.")
+        print("Rounds in log: " + str(log.numberOfRounds))
+        if args.output:
+            print("RoundNumber, WinningNumber, ParticipantPick, HostShow, ResultStick, ResultRandom, ResultSwap")
+            for round in log.replay(args.first, lastRound):
+                print(str(round[0]) + ":" + str(round[1]) + ":" + str(round[2]) + ":" + str(round[3]) + ":" + str(round[4]) + ":" + str(round[5]) + ":" + str(round[6]))
+        results = log.results(args.first, lastRound)
+        print("Results for rounds " + str(args.first) + " to " + str(lastRound))
+        print("============================================================")
+        if numberOfRounds:
+            print("Stick  = " + str(results[0]) + " : " + str((float(results[0]) / numberOfRounds) * 100) + " %")
+            print("Random = " + str(results[1]) + " : " + str((float(results[1]) / numberOfRounds) * 100) + " %")
+            print("Swap   = " + str(results[2]) + " : " + str((float(results[2]) / numberOfRounds) * 100) + " %")
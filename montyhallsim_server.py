@@ -0,0 +1,286 @@
+# Monty Hall Simulator - Server
+#######################################
+# Author: Dave Auld
+# Version: 1.0
+# Date: 18th October 2026
+# Description: Long running simulation
+# server over a local TCP or Unix
+# socket. Keeps a warm process pool,
+# packs the blocks of small concurrent
+# jobs into shared pool tasks, and
+# answers repeated seeded jobs from an
+# LRU result cache. Jobs and results
+# are JSON, one object per line.
+#
+# License: MIT
+#######################################
+
+import argparse                             # argparse added to support command line parameter functionality
+import asyncio                              # used for the socket server
+import json                                 # used for the jobs and results on the wire
+import multiprocessing                      # Required to get CPU max logical cores, and support multiprocess/pools
+import signal                               # used to leave Ctrl-C to the server process
+import socket                               # used by the client
+from collections import OrderedDict, deque  # used for the LRU result cache, and the jobs waiting for the pool
+from timeit import default_timer as timer   # used for timing the jobs.
+from montyhallsim_core import defaultDoors, defaultConfidence, defaultBlockSize, blocks  # shared block streams
+from montyhallsim_engines import engines, streamKind, engineBlockSize, playBlock, playBatches, playCells, requireNumpy, loadJit  # the simulation engines
+from montyhallsim_api import SimulationResult, checkSettings  # result and settings of a simulation
+
+# Settings a job may set, anything else is refused
+jobKeys = ["rounds", "engine", "seed", "doors", "reveals", "blockSize"]
+
+# Type of each job setting, seed, reveals and blockSize may also be null for their defaults
+jobTypes = {"rounds": int, "engine": str, "seed": int, "doors": int, "reveals": int, "blockSize": int}
+optionalKeys = ["seed", "reveals", "blockSize"]
+
+def playTask(items):
+    # Pool task, plays blocks that may come from several jobs. items is a list of
+    # [(BlockNumber, FirstRound, RoundCount), Kind, Seed, Doors, Reveals], returns a (stick, random, swap) tuple for each.
+    counts = []
+    for block, kind, seed, doors, reveals in items:
+        result = [0,0,0]
+        if kind == "numpy":
+            playBatches([block], seed, doors, reveals, result)
+        elif kind == "aggregate":
+            playCells([block], seed, doors, reveals, result)
+        elif kind == "jit":
+            result = loadJit().playBlocks(seed, [block], doors, reveals)[0]
+        else:
+            playBlock(block, seed, doors, reveals, result)
+        counts.append(tuple(result))
+    return counts
+
+def initProc():
+    # Pool processes ignore Ctrl-C, the server process shuts the pool down
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+class Job:
+    # A job in progress, its wins are added as its blocks come back from the pool.
+
+    def __init__(self, key, settings, blockCount, future):
+        self.key = key
+        self.settings = settings
+        self.results = [0,0,0]
+        self.remaining = blockCount
+        self.future = future
+        self.startTime = timer()
+
+class SimulationServer:
+    # Plays jobs on a warm process pool. Blocks arriving within batchWindow seconds of each other are
+    # packed into pool tasks of up to taskRounds rounds, so many small jobs share a task.
+
+    def __init__(self, workers=None, cacheSize=1024, batchWindow=0.002, taskRounds=defaultBlockSize, tasksAhead=4):
+        self.workers = workers or multiprocessing.cpu_count()
+        self.tasksAhead = tasksAhead        # Tasks per process handed to the pool ahead of time
+        self.cacheSize = cacheSize
+        self.batchWindow = batchWindow
+        self.taskRounds = taskRounds
+        self.cache = OrderedDict()          # Seeded results by job key, least recently used first
+        self.running = {}                   # Seeded jobs being played by job key, repeats wait on the same future
+        self.pending = deque()              # [Job, Blocks] with blocks still to be packed into tasks, taken in turn
+        self.inFlight = 0                   # Tasks handed to the pool and not yet back
+        self.dispatchHandle = None
+        self.loop = None
+        self.pool = multiprocessing.Pool(self.workers, initializer=initProc)
+
+    def jobSettings(self, job):
+        # Check a job and fill in its defaults, raises ValueError for any that are not valid.
+        unknown = [key for key in job if key not in jobKeys]
+        if unknown:
+            raise ValueError("unknown job settings " + ", ".join(sorted(unknown)) + ", expected " + ", ".join(jobKeys))
+        for key, value in job.items():
+            if value is None and key in optionalKeys:
+                continue
+            # bool is an int in Python, but true is not a number of rounds
+            if not isinstance(value, jobTypes[key]) or isinstance(value, bool):
+                raise ValueError(key + " must be " + ("a string" if jobTypes[key] is str else "an integer") + ", not " + json.dumps(value))
+        engine = job.get("engine", "single")
+        if engine == "distributed":
+            raise ValueError("the distributed engine can not be played by the server, its blocks are played on its own workers")
+        if engine == "auto":
+            raise ValueError("the server plays every job on its own pool, name the engine rather than auto")
+        doors = job.get("doors", defaultDoors)
+        rounds, reveals, seed = checkSettings(engine, job.get("rounds", 1000), doors, job.get("reveals"), job.get("seed"),
+                                              None, defaultConfidence, None)
+        if streamKind(engine) not in ("python", "jit"):
+            requireNumpy(engine)
+        blockSize = job.get("blockSize") or engineBlockSize(engine)
+        if blockSize < 1:
+            raise ValueError("the block size must be at least 1")
+        return {"engine": engine, "rounds": rounds, "seed": seed, "doors": doors, "reveals": reveals, "blockSize": blockSize}
+
+    async def simulate(self, job):
+        # Play a job, returns [SimulationResult, Cached]. Seeded jobs are looked up in the cache first.
+        settings = self.jobSettings(job)
+        seeded = job.get("seed") is not None
+        key = (streamKind(settings["engine"]), settings["rounds"], settings["seed"], settings["doors"], settings["reveals"], settings["blockSize"])
+
+        if seeded:
+            if key in self.cache:
+                self.cache.move_to_end(key)
+                return self.result(settings, self.cache[key], 0.0), True
+            if key in self.running:
+                results, duration = await asyncio.shield(self.running[key])
+                return self.result(settings, results, duration), True
+
+        future = self.loop.create_future()
+        newJob = Job(key, settings, -(-settings["rounds"] // settings["blockSize"]), future)
+        if seeded:
+            self.running[key] = future
+        # The blocks are made as they are packed into tasks, so a large job holds no list of them
+        self.pending.append((newJob, blocks(settings["rounds"], settings["blockSize"])))
+        if self.dispatchHandle is None:
+            self.dispatchHandle = self.loop.call_later(self.batchWindow, self.dispatch)
+
+        try:
+            results, duration = await asyncio.shield(future)
+        finally:
+            if seeded:
+                del self.running[key]
+        if seeded:
+            self.cache[key] = results
+            if len(self.cache) > self.cacheSize:
+                self.cache.popitem(last=False)
+        return self.result(settings, results, duration), False
+
+    def result(self, settings, results, duration):
+        return SimulationResult(settings["engine"], settings["rounds"], list(results), duration, settings["seed"], settings["doors"],
+                                settings["reveals"], self.workers, settings["blockSize"], defaultConfidence)
+
+    def dispatch(self):
+        # Pack the pending blocks into pool tasks, small blocks from different jobs share a task. Only
+        # tasksAhead tasks per process are handed to the pool at once, the rest are packed as tasks come back.
+        self.dispatchHandle = None
+        task = []
+        taskRounds = 0
+        while self.pending and self.inFlight < self.workers * self.tasksAhead:
+            job, pendingBlocks = self.pending[0]
+            block = next(pendingBlocks, None) if not job.future.done() else None
+            if block is None:                   # All packed, or the job failed
+                self.pending.popleft()
+                continue
+            if task and taskRounds + block[2] > self.taskRounds:
+                self.submit(task)
+                task = []
+                taskRounds = 0
+            task.append((job, block))
+            taskRounds += block[2]
+            self.pending.rotate(-1)             # The next block comes from the next job, so a large job does not hold up small ones
+        if task:
+            self.submit(task)
+
+    def submit(self, task):
+        jobs = [job for job, block in task]
+        self.inFlight += 1
+        items = [(block, job.key[0], job.settings["seed"], job.settings["doors"], job.settings["reveals"]) for job, block in task]
+        # The pool calls back on its own thread, the counts are handed to the event loop to add.
+        self.pool.apply_async(playTask, (items, ),
+                              callback=lambda counts: self.loop.call_soon_threadsafe(self.taskDone, jobs, counts),
+                              error_callback=lambda error: self.loop.call_soon_threadsafe(self.taskFailed, jobs, error))
+
+    def taskDone(self, jobs, counts):
+        self.taskBack()
+        for job, result in zip(jobs, counts):
+            job.results[0] += result[0]
+            job.results[1] += result[1]
+            job.results[2] += result[2]
+            job.remaining -= 1
+            if job.remaining == 0 and not job.future.done():
+                job.future.set_result((job.results, timer() - job.startTime))
+
+    def taskFailed(self, jobs, error):
+        self.taskBack()
+        for job in jobs:
+            if not job.future.done():
+                job.future.set_exception(error)
+
+    def taskBack(self):
+        # A task came back from the pool, pack more of the pending blocks
+        self.inFlight -= 1
+        if self.pending and self.dispatchHandle is None:
+            self.dispatchHandle = self.loop.call_soon(self.dispatch)
+
+    async def handleConnection(self, reader, writer):
+        # Each line is a job, each answer is a line with the result, or with an error.
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    job = json.loads(line)
+                    if not isinstance(job, dict):
+                        raise ValueError("a job must be a JSON object")
+                    result, cached = await self.simulate(job)
+                    answer = result.asDict()
+                    answer["cached"] = cached
+                except (ValueError, ImportError) as e:
+                    answer = {"error": str(e)}
+                except Exception as e:
+                    # Any other failure of a job is answered too, the connection carries on with the next job
+                    answer = {"error": "the job failed, " + type(e).__name__ + ": " + str(e)}
+                writer.write((json.dumps(answer) + "\n").encode())
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host="127.0.0.1", port=8765, path=None):
+        # Serve until cancelled, on the Unix socket path when set, otherwise on host and port
+        self.loop = asyncio.get_running_loop()
+        if path:
+            server = await asyncio.start_unix_server(self.handleConnection, path=path)
+        else:
+            server = await asyncio.start_server(self.handleConnection, host, port)
+        async with server:
+            await server.serve_forever()
+
+    def close(self):
+        # Jobs still being played are abandoned
+        self.pool.terminate()
+        self.pool.join()
+
+def request(job, address=("127.0.0.1", 8765)):
+    # Send a job to a server and return its answer. address is (Host, Port), or the path of a Unix socket.
+    # Raises ValueError with the server's message for a job it refused.
+    if isinstance(address, str):
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    else:
+        connection = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    with connection:
+        connection.connect(address)
+        connection.sendall((json.dumps(job) + "\n").encode())
+        answer = json.loads(connection.makefile("rb").readline())
+    if "error" in answer:
+        raise ValueError(answer["error"])
+    return answer
+
+def main():
+    processLimit = multiprocessing.cpu_count()  # Process Limit
+
+    # Setup the argparse
+    parser = argparse.ArgumentParser(prog="montyhallsim_server",
+                                    description='''Monty Hall Simulation server. Accepts jobs as JSON lines, eg {"rounds": 100000, "engine": "multiproc", "seed": 1},
+                                            and answers each with a JSON line of the results.''')
+    parser.add_argument("-H", "--host", default="127.0.0.1", help="Address to listen on. Default is 127.0.0.1.")
+    parser.add_argument("-P", "--port", type=int, default=8765, help="Port to listen on. Integer. Default is 8765.")
+    parser.add_argument("-u", "--unix", default=None, help="Listen on the Unix socket UNIX instead of TCP.")
+    parser.add_argument("-p", "--procs", type=int, default=processLimit, help="Set the number of processes. Integer. Default is CPU Logical Cores. " + str(processLimit))
+    parser.add_argument("-c", "--cache", type=int, default=1024, help="Number of seeded results to keep. Integer. Default is 1024.")
+    parser.add_argument("-w", "--window", type=float, default=2, help="Milliseconds to wait for other jobs to share pool tasks with. Float. Default is 2.")
+    args = parser.parse_args()
+
+    server = SimulationServer(max(args.procs, 1), max(args.cache, 0), args.window / 1000.0)
+    print("Monty Hall Simulator Server, " + str(server.workers) + " processes.")
+    print("Listening on " + (args.unix if args.unix else args.host + ":" + str(args.port)))
+    try:
+        asyncio.run(server.serve(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# Monty Hall Simulator - Result Store
+#######################################
+# Author: Dave Auld
+# Version: 1.0
+# Date: 18th October 2026
+# Description: On disk store of seeded
+# results, keyed by the random stream
+# kind, seed, boxes, host reveals and
+# block size. A repeated run is answered
+# straight from the store, and a longer
+# run carries on from the stored counts
+# at the last whole block. The store is
+# an SQLite database in WAL mode, so any
+# number of jobs can read it while one
+# at a time writes.
+#
+# License: MIT
+#######################################
+
+import sqlite3                              # used for the store database
+
+# Seconds a job waits for another job's write to finish before giving up
+busyTimeout = 30
+
+class ResultStore:
+    # Stored win counts, [stick, random, swap], by key and number of rounds. key is
+    # (Kind, Seed, Doors, Reveals, BlockSize), Kind as montyhallsim_engines.streamKind.
+
+    def __init__(self, path):
+        self.connection = sqlite3.connect(path, timeout=busyTimeout, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("""CREATE TABLE IF NOT EXISTS results (
+                                       kind TEXT, seed TEXT, doors INTEGER, reveals INTEGER, blockSize INTEGER, rounds INTEGER,
+                                       stick INTEGER, random INTEGER, swap INTEGER,
+                                       PRIMARY KEY (kind, seed, doors, reveals, blockSize, rounds))""")
+
+    def keyValues(self, key):
+        # The seed can use all 64 bits, more than an SQLite integer holds, so it is stored as text
+        kind, seed, doors, reveals, blockSize = key
+        return (kind, str(seed), doors, reveals, blockSize)
+
+    def lookup(self, key, rounds):
+        # Stored counts for exactly rounds, None when the store does not have them
+        row = self.connection.execute("""SELECT stick, random, swap FROM results
+                                         WHERE kind = ? AND seed = ? AND doors = ? AND reveals = ? AND blockSize = ? AND rounds = ?""",
+                                      self.keyValues(key) + (rounds, )).fetchone()
+        return list(row) if row else None
+
+    def base(self, key, rounds):
+        # Longest stored run of whole blocks that is no longer than rounds, returns [Rounds, Results].
+        # A run can carry on from it with the blocks after it, as each block draws from its own stream.
+        row = self.connection.execute("""SELECT rounds, stick, random, swap FROM results
+                                         WHERE kind = ? AND seed = ? AND doors = ? AND reveals = ? AND blockSize = ?
+                                         AND rounds <= ? AND rounds % blockSize = 0
+                                         ORDER BY rounds DESC LIMIT 1""",
+                                      self.keyValues(key) + (rounds, )).fetchone()
+        if row is None:
+            return 0, [0,0,0]
+        return row[0], list(row[1:])
+
+    def save(self, key, rounds, results):
+        # Each save is a single statement, so it is atomic and readers never see part of it
+        self.connection.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                                self.keyValues(key) + (rounds, results[0], results[1], results[2]))
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,346 @@
+# Monty Hall Simulator - Strategies
+#######################################
+# Author: Dave Auld
+# Version: 1.0
+# Date: 18th October 2026
+# Description: Compares any number of
+# participant strategies under a chosen
+# host behaviour. Strategies and hosts
+# are small plugin classes. Each block
+# of rounds is drawn once as NumPy
+# arrays and every strategy is scored
+# on the same draws (common random
+# numbers), so 20 strategies cost about
+# the same as 3 and the differences
+# between them have a lower variance
+# than separate runs would give.
+#
+# License: MIT
+#######################################
+
+import argparse                             # argparse added to support command line parameter functionality
+import multiprocessing                      # Required to get CPU max logical cores
+import sys                                  # used for the exit status of an interrupted run
+import threading                            # Required for multi-threading
+from math import sqrt                       # used for the intervals of the differences
+from timeit import default_timer as timer   # used for timing the runs.
+from montyhallsim_core import defaultDoors, defaultConfidence, newSeed, blocks, blockGenerator, checkDoors, zScore, wilsonInterval
+from montyhallsim_engines import NumpyEngine, requireNumpy, joinThreads  # NumPy block size and threads
+
+class Draws:
+    # Shared draws of a batch of rounds. correct is where the pick was the winning box. The host fills in
+    # offered, where it opened boxes and offered a change, void, where the round does not count, and
+    # winnerClosed, where the winning box is one of the closedOthers boxes left closed besides the pick.
+    # switchDraw and boxDraw are uniform draws the strategies share, a strategy that changes goes to a
+    # random closed box, which is the winning one where boxHit is set.
+
+    def __init__(self, rng, count, doors, reveals):
+        import numpy as np
+        self.count = count
+        self.doors = doors
+        self.reveals = reveals
+        self.closedOthers = doors - 1 - reveals
+        correctDraw, self.hostDraw, self.switchDraw, self.boxDraw = rng.random((4, count))
+        self.correct = correctDraw < 1.0 / doors
+        self.boxHit = self.boxDraw < 1.0 / self.closedOthers
+        self.offered = np.ones(count, dtype=bool)
+        self.void = np.zeros(count, dtype=bool)
+        self.winnerClosed = ~self.correct
+
+class StandardHost:
+    # Knows where the prize is and always opens losing boxes, the classic game
+    name = "standard"
+
+    def reveal(self, draws):
+        pass
+
+class IgnorantHost:
+    # Monty Fall, opens boxes at random from those that were not picked. Rounds where the
+    # prize is revealed are void, so the counts are of the rounds where it stayed hidden.
+    name = "ignorant"
+
+    def reveal(self, draws):
+        draws.void = ~draws.correct & (draws.hostDraw < float(draws.reveals) / (draws.doors - 1))
+        draws.winnerClosed = ~draws.correct & ~draws.void
+
+class AngelicHost:
+    # Only offers a change when the pick was wrong
+    name = "angelic"
+
+    def reveal(self, draws):
+        draws.offered = ~draws.correct
+
+class DevilishHost:
+    # Monty from Hell, only offers a change when the pick was right
+    name = "devilish"
+
+    def reveal(self, draws):
+        draws.offered = draws.correct
+
+class StickStrategy:
+    # Never changes
+    name = "stick"
+
+    def switches(self, draws):
+        return False
+
+class SwapStrategy:
+    # Always changes to one of the other closed boxes
+    name = "swap"
+
+    def switches(self, draws):
+        return True
+
+class RandomStrategy:
+    # Picks any of the closed boxes, including the original pick
+    name = "random"
+
+    def switches(self, draws):
+        return draws.switchDraw >= 1.0 / (draws.closedOthers + 1)
+
+class BiasedStrategy:
+    # Sticks with probability stick, otherwise changes. All biased strategies share the
+    # switch draw, so their counts move together and their differences are small.
+
+    def __init__(self, stick):
+        if stick < 0 or stick > 1:
+            raise ValueError("the stick probability must be between 0 and 1")
+        self.stick = stick
+        self.name = "biased:" + str(stick)
+
+    def switches(self, draws):
+        return draws.switchDraw >= self.stick
+
+# Hosts and strategies by name. A plugin is a class with a name, a host has reveal(draws) and
+# a strategy has switches(draws), returning where it changes box when offered, as a bool or array.
+hosts = {
+    "standard": StandardHost,
+    "ignorant": IgnorantHost,
+    "angelic": AngelicHost,
+    "devilish": DevilishHost,
+}
+
+strategies = {
+    "stick": StickStrategy,
+    "swap": SwapStrategy,
+    "random": RandomStrategy,
+    "biased": BiasedStrategy,
+}
+
+defaultStrategies = ["stick", "random", "swap"]
+
+def parseStrategy(text):
+    # Strategy from its name, with any parameter after a colon, eg biased:0.25
+    name, separator, parameter = text.partition(":")
+    if name not in strategies:
+        raise ValueError("unknown strategy " + repr(name) + ", expected one of " + ", ".join(sorted(strategies)))
+    if not separator:
+        try:
+            return strategies[name]()
+        except TypeError:
+            raise ValueError("the " + name + " strategy needs a probability, eg " + name + ":0.25")
+    try:
+        return strategies[name](float(parameter))
+    except TypeError:
+        raise ValueError("the " + name + " strategy takes no parameter")
+
+def parseHost(text):
+    if text not in hosts:
+        raise ValueError("unknown host " + repr(text) + ", expected one of " + ", ".join(sorted(hosts)))
+    return hosts[text]()
+
+class StrategyCounts:
+    # Counts of a comparison. scored is the rounds that were not void, wins the wins of each strategy,
+    # gains and losses the rounds each strategy won and the first strategy lost, and the other way round.
+
+    def __init__(self, strategyCount):
+        self.scored = 0
+        self.wins = [0] * strategyCount
+        self.gains = [0] * strategyCount
+        self.losses = [0] * strategyCount
+
+    def add(self, counts):
+        self.scored += counts.scored
+        for i in range(len(self.wins)):
+            self.wins[i] += counts.wins[i]
+            self.gains[i] += counts.gains[i]
+            self.losses[i] += counts.losses[i]
+
+def playStrategies(blockList, seed, doors, reveals, host, strategyList, counts, stopping=None):
+    # Draw each block once from its own random stream and score every strategy on it, adding into counts
+    import numpy as np
+    for block in blockList:
+        if stopping is not None and stopping.is_set():
+            break
+        draws = Draws(blockGenerator(seed, block[0]), block[2], doors, reveals)
+        host.reveal(draws)
+        counted = ~draws.void
+        counts.scored += int(np.count_nonzero(counted))
+        changeWins = draws.winnerClosed & draws.boxHit
+        baseline = None
+        for i, strategy in enumerate(strategyList):
+            won = np.where(draws.offered & strategy.switches(draws), changeWins, draws.correct) & counted
+            if baseline is None:
+                baseline = won
+            counts.wins[i] += int(np.count_nonzero(won))
+            counts.gains[i] += int(np.count_nonzero(won & ~baseline))
+            counts.losses[i] += int(np.count_nonzero(baseline & ~won))
+
+class StrategyResult:
+    # Result of a comparison, names holds the strategies in the order given, the first is the
+    # one the others are compared with.
+
+    def __init__(self, host, names, rounds, counts, duration, seed, doors, reveals, workers, blockSize, confidence):
+        self.host = host
+        self.names = names
+        self.rounds = rounds
+        self.scored = counts.scored
+        self.wins = counts.wins
+        self.gains = counts.gains
+        self.losses = counts.losses
+        self.duration = duration
+        self.seed = seed
+        self.doors = doors
+        self.reveals = reveals
+        self.workers = workers
+        self.blockSize = blockSize
+        self.confidence = confidence
+
+    @property
+    def rates(self):
+        # Win rate of each strategy over the rounds that counted
+        return [float(wins) / self.scored if self.scored else 0.0 for wins in self.wins]
+
+    def intervals(self, confidence=None):
+        z = zScore(confidence or self.confidence)
+        return [wilsonInterval(wins, self.scored, z) for wins in self.wins]
+
+    def differences(self, confidence=None):
+        # Difference of each strategy's win rate from the first strategy's, with the half width of its interval,
+        # [(Difference, HalfWidth), ...]. Both are scored on the same rounds, so only the rounds where they
+        # differ add to the variance.
+        z = zScore(confidence or self.confidence)
+        differences = []
+        for gains, losses in zip(self.gains, self.losses):
+            if not self.scored:
+                differences.append((0.0, 0.0))
+                continue
+            difference = float(gains - losses) / self.scored
+            variance = max(float(gains + losses) / self.scored - difference * difference, 0.0) / self.scored
+            differences.append((difference, z * sqrt(variance)))
+        return differences
+
+    def asDict(self):
+        return {
+            "host": self.host,
+            "strategies": list(self.names),
+            "rounds": self.rounds,
+            "scored": self.scored,
+            "wins": list(self.wins),
+            "rates": self.rates,
+            "differences": [difference for difference, halfWidth in self.differences()],
+            "duration": self.duration,
+            "seed": self.seed,
+            "doors": self.doors,
+            "reveals": self.reveals,
+            "workers": self.workers,
+            "blockSize": self.blockSize,
+        }
+
+def compareStrategies(rounds=1000, strategyList=defaultStrategies, host="standard", seed=None, doors=defaultDoors, reveals=None,
+                      workers=1, blockSize=None, confidence=defaultConfidence):
+    # Score every strategy in strategyList on the same rounds and return a StrategyResult. Strategies and the host
+    # are names, see parseStrategy, or plugin objects. Each thread of workers plays a contiguous run of blocks.
+    requireNumpy("strategies")
+    if reveals is None:
+        reveals = doors - 2
+    checkDoors(doors, reveals)
+    if rounds < 1:
+        raise ValueError("the number of rounds must be at least 1")
+    if not strategyList:
+        raise ValueError("at least one strategy is needed")
+    if seed is None:
+        seed = newSeed()
+    elif seed < 0:
+        raise ValueError("the seed must be a non-negative integer")
+    strategyList = [parseStrategy(strategy) if isinstance(strategy, str) else strategy for strategy in strategyList]
+    host = parseHost(host) if isinstance(host, str) else host
+    workers = workers or multiprocessing.cpu_count()
+    blockSize = blockSize or NumpyEngine.blockSize
+
+    startTime = timer()
+    blockList = list(blocks(rounds, blockSize))
+    runLength = -(-len(blockList) // workers)   # Blocks per thread, rounded up
+    stopping = threading.Event()
+    threadCounts = []
+    threads = []
+    for t in range(workers):
+        run = blockList[t * runLength:(t + 1) * runLength]
+        if not run:
+            break
+        threadCounts.append(StrategyCounts(len(strategyList)))
+        threads.append(threading.Thread(target=playStrategies, name="t"+str(t),
+                                        args=(run, seed, doors, reveals, host, strategyList, threadCounts[t], stopping)))
+    for t in threads:
+        t.start()
+    joinThreads(threads, stopping)
+
+    counts = StrategyCounts(len(strategyList))
+    for threadCount in threadCounts:
+        counts.add(threadCount)
+    return StrategyResult(host.name, [strategy.name for strategy in strategyList], rounds, counts, timer() - startTime, seed,
+                          doors, reveals, len(threads), blockSize, confidence)
+
+def printStrategies(result):
+    # Display each strategy's wins and interval, and its difference from the first strategy
+    width = max(len(name) for name in result.names)
+    confidence = str(result.confidence * 100) + "% CI"
+    for i, name in enumerate(result.names):
+        low, high = result.intervals()[i]
+        print(name.ljust(width) + " = " + str(result.wins[i]) + " : " + str(result.rates[i] * 100) + " %, "
+              + confidence + " " + str(low * 100) + " % to " + str(high * 100) + " %")
+    for i, (difference, halfWidth) in enumerate(result.differences()):
+        if i:
+            print(result.names[i].ljust(width) + " - " + result.names[0] + " = " + format(difference * 100, "+") + " % +/- "
+                  + str(halfWidth * 100) + " %")
+
+def main():
+    threadLimit = multiprocessing.cpu_count()   # Thread Limit
+
+    # Setup the argparse
+    parser = argparse.ArgumentParser(prog="montyhallsim_strategies",
+                                    description='''Monty Hall Strategy comparison. Scores every strategy on the same rounds, and shows
+                                            each one's wins and its difference from the first strategy.''')
+    parser.add_argument("strategies", nargs="*", default=defaultStrategies,
+                        help="Strategies to compare, any of " + ", ".join(sorted(strategies)) + ", biased takes the stick probability as biased:P. Default is " + " ".join(defaultStrategies) + ".")
+    parser.add_argument("-r", "--rounds", type=int, default=1000000, help="Set the number of rounds. Integer. Default is 1000000.")
+    parser.add_argument("-H", "--host", default="standard", help="Host behaviour, one of " + ", ".join(sorted(hosts)) + ". Default is standard.")
+    parser.add_argument("-s", "--seed", type=int, default=None, help="Set the master random seed. Non-negative Integer. Default is a new random seed.")
+    parser.add_argument("-d", "--doors", type=int, default=defaultDoors, help="Set the number of boxes. Integer. Default is " + str(defaultDoors) + ".")
+    parser.add_argument("-k", "--reveals", type=int, default=None, help="Set the number of boxes the host opens. Integer. Default is the number of boxes less 2.")
+    parser.add_argument("-t", "--threads", type=int, default=threadLimit, help="Set the number of threads. Integer. Default is CPU Logical Cores. " + str(threadLimit))
+    parser.add_argument("-b", "--blocksize", type=int, default=NumpyEngine.blockSize, help="Set the number of rounds per random stream block. Integer. Default is " + str(NumpyEngine.blockSize) + ".")
+    parser.add_argument("-c", "--confidence", type=float, default=defaultConfidence, help="Set the confidence level of the intervals. Float. Default is " + str(defaultConfidence) + ".")
+    args = parser.parse_args()
+    if args.seed is None:
+        args.seed = newSeed()
+
+    print("Monty Hall Strategy Comparison, " + str(args.doors) + " boxes, " + args.host + " host.")
+    print("Number of Rounds: " + str(args.rounds))
+    print("Seed: " + str(args.seed))
+    try:
+        result = compareStrategies(args.rounds, args.strategies, args.host, args.seed, args.doors, args.reveals, max(args.threads, 1),
+                                   max(args.blocksize, 1), args.confidence)
+    except (ValueError, ImportError) as e:
+        parser.error(str(e))
+    except KeyboardInterrupt:
+        print("Interrupted.")
+        sys.exit(130)
+
+    print("Results for " + str(result.scored) + " rounds counted, using " + str(result.workers) + " threads.")
+    print("============================================================")
+    print("Duration, " + str(result.duration) + " seconds.")
+    printStrategies(result)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+# Monty Hall Simulator - Parameter Sweep
+#######################################
+# Author: Dave Auld
+# Version: 1.0
+# Date: 18th October 2026
+# Description: Plays every point of a
+# grid of boxes, host reveals, hosts,
+# strategies and round budgets on one
+# shared process pool, and writes the
+# results to one columnar table keyed by
+# the parameters. Every point is split
+# into small blocks that idle processes
+# take one at a time, so cheap points
+# never leave processes waiting on
+# expensive ones. The strategies of a
+# point are scored on the same draws,
+# and a budget shares its whole blocks
+# with the larger budgets of the point.
+# Requires numpy.
+#
+# License: MIT
+#######################################
+
+import argparse                             # argparse added to support command line parameter functionality
+import csv                                  # used for the table as CSV
+import json                                 # used for the grid file and the table as JSON
+import multiprocessing                      # Required to get CPU max logical cores, and support multiprocess/pools
+import signal                               # used to leave Ctrl-C to the parent process
+import sys                                  # used for the exit status of an interrupted run
+from timeit import default_timer as timer   # used for timing the sweep.
+from montyhallsim_core import defaultDoors, defaultConfidence, newSeed, blocks, checkDoors, zScore, wilsonInterval
+from montyhallsim_engines import requireNumpy  # numpy is needed by the strategies
+from montyhallsim_strategies import StrategyCounts, playStrategies, parseStrategy, parseHost, defaultStrategies  # strategy plugins
+
+# Default number of rounds in a block, small so the points share out evenly between the processes
+defaultBlockSize = 100000
+
+# Columns of the table, the parameters first
+tableColumns = ["doors", "reveals", "host", "rounds", "strategy", "scored", "wins", "rate", "low", "high"]
+
+# Grid dimensions and their defaults, reveals defaults to the number of boxes less 2
+defaultGrid = {
+    "doors": [defaultDoors],
+    "reveals": None,
+    "hosts": ["standard"],
+    "strategies": defaultStrategies,
+    "rounds": [1000000],
+}
+
+def gridPoints(grid):
+    # Points of the grid that are playable, as (Doors, Reveals, Host) with the round budgets of each.
+    # Combinations of boxes and reveals the host can not play are left out.
+    points = []
+    for doors in grid["doors"]:
+        for reveals in grid["reveals"] or [doors - 2]:
+            try:
+                checkDoors(doors, reveals)
+            except ValueError:
+                continue
+            for host in grid["hosts"]:
+                points.append((doors, reveals, host))
+    return points
+
+def pointTasks(points, budgets, blockSize, seed, strategyNames):
+    # Pool tasks of the sweep, every block of every point. Whole blocks are shared by all of a point's
+    # budgets, only the last part block of a budget is played for it alone.
+    for pointNumber, (doors, reveals, host) in enumerate(points):
+        needed = set(blocks(max(budgets) - max(budgets) % blockSize, blockSize))
+        for rounds in budgets:
+            needed.update(block for block in blocks(rounds, blockSize) if block[2] < blockSize)
+        for block in sorted(needed):
+            yield (pointNumber, block, seed, doors, reveals, host, strategyNames)
+
+def sweepTask(task):
+    # Pool task, scores the strategies on one block of a point, returns (PointNumber, Block, StrategyCounts)
+    pointNumber, block, seed, doors, reveals, host, strategyNames = task
+    strategyList = [parseStrategy(name) for name in strategyNames]
+    counts = StrategyCounts(len(strategyList))
+    playStrategies([block], seed, doors, reveals, parseHost(host), strategyList, counts)
+    return pointNumber, block, counts
+
+def initProc():
+    # Ctrl-C is handled by the parent, which stops the pool
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+class SweepTable:
+    # Results of a sweep as columns, one row per point, budget and strategy. columns holds a list for
+    # each of tableColumns, rows() gives the rows as tuples.
+
+    def __init__(self, seed, blockSize, workers, duration):
+        self.columns = dict((name, []) for name in tableColumns)
+        self.seed = seed
+        self.blockSize = blockSize
+        self.workers = workers
+        self.duration = duration
+
+    def addRow(self, row):
+        for name, value in zip(tableColumns, row):
+            self.columns[name].append(value)
+
+    def rows(self):
+        return list(zip(*[self.columns[name] for name in tableColumns]))
+
+    def lookup(self, doors, reveals, host, rounds, strategy):
+        # Row of the table for one parameter tuple, as a dictionary, None when the sweep did not play it
+        key = (doors, reveals, host, rounds, strategy)
+        for row in self.rows():
+            if row[:5] == key:
+                return dict(zip(tableColumns, row))
+        return None
+
+    def save(self, path):
+        # Write the table as JSON, an object of columns, or as CSV when path ends .csv
+        if path.endswith(".csv"):
+            with open(path, "w", newline="") as tableFile:
+                writer = csv.writer(tableFile)
+                writer.writerow(tableColumns)
+                writer.writerows(self.rows())
+        else:
+            with open(path, "w") as tableFile:
+                json.dump({"seed": self.seed, "blockSize": self.blockSize, "columns": self.columns}, tableFile)
+
+def sweep(grid, seed=None, workers=None, blockSize=defaultBlockSize, confidence=defaultConfidence, progress=None):
+    # Play every point of grid on one process pool and return a SweepTable. grid has lists of doors,
+    # reveals, hosts, strategies and rounds, anything left out takes its value from defaultGrid.
+    # Each point draws from the blocks of the one seed, so points differ only by their parameters.
+    # progress, when set, is called with the number of blocks finished and the total.
+    requireNumpy("sweep")
+    unknown = [key for key in grid if key not in defaultGrid]
+    if unknown:
+        raise ValueError("unknown grid settings " + ", ".join(sorted(unknown)) + ", expected " + ", ".join(defaultGrid))
+    grid = dict(defaultGrid, **grid)
+    strategyNames = list(grid["strategies"])
+    for name in strategyNames:
+        parseStrategy(name)
+    for host in grid["hosts"]:
+        parseHost(host)
+    budgets = sorted(set(grid["rounds"]))
+    if not budgets or budgets[0] < 1:
+        raise ValueError("every round budget must be at least 1")
+    if blockSize < 1:
+        raise ValueError("the block size must be at least 1")
+    points = gridPoints(grid)
+    if not points:
+        raise ValueError("the grid has no point the host can play")
+    if seed is None:
+        seed = newSeed()
+    workers = workers or multiprocessing.cpu_count()
+
+    startTime = timer()
+    tasks = list(pointTasks(points, budgets, blockSize, seed, strategyNames))
+    blockCounts = {}                        # StrategyCounts by (PointNumber, Block)
+    pool = multiprocessing.Pool(workers, initializer=initProc)
+    try:
+        # One block per task, a process that finishes early takes the next task straight away
+        for pointNumber, block, counts in pool.imap_unordered(sweepTask, tasks, chunksize=1):
+            blockCounts[(pointNumber, block)] = counts
+            if progress:
+                progress(len(blockCounts), len(tasks))
+    except KeyboardInterrupt:
+        pool.terminate()
+        raise
+    finally:
+        pool.close()
+        pool.join()
+
+    table = SweepTable(seed, blockSize, workers, timer() - startTime)
+    z = zScore(confidence)
+    for pointNumber, (doors, reveals, host) in enumerate(points):
+        for rounds in budgets:
+            counts = StrategyCounts(len(strategyNames))
+            for block in blocks(rounds, blockSize):
+                counts.add(blockCounts[(pointNumber, block)])
+            for name, wins in zip(strategyNames, counts.wins):
+                low, high = wilsonInterval(wins, counts.scored, z)
+                rate = float(wins) / counts.scored if counts.scored else 0.0
+                table.addRow((doors, reveals, host, rounds, name, counts.scored, wins, rate, low, high))
+    return table
+
+def main():
+    processLimit = multiprocessing.cpu_count()  # Process Limit
+
+    # Setup the argparse
+    parser = argparse.ArgumentParser(prog="montyhallsim_sweep",
+                                    description='''Monty Hall Parameter Sweep. Plays every combination of the boxes, reveals, hosts and round
+                                            budgets on one process pool, scoring the strategies of each on the same rounds.''')
+    parser.add_argument("-d", "--doors", type=int, nargs="+", default=defaultGrid["doors"], help="Numbers of boxes. Integers. Default is " + str(defaultDoors) + ".")
+    parser.add_argument("-k", "--reveals", type=int, nargs="+", default=None, help="Numbers of boxes the host opens, combinations the host can not play are left out. Integers. Default is the number of boxes less 2.")
+    parser.add_argument("-H", "--hosts", nargs="+", default=defaultGrid["hosts"], help="Host behaviours, see montyhallsim_strategies.py. Default is standard.")
+    parser.add_argument("-x", "--strategies", nargs="+", default=defaultGrid["strategies"], help="Strategies, see montyhallsim_strategies.py. Default is " + " ".join(defaultStrategies) + ".")
+    parser.add_argument("-r", "--rounds", type=int, nargs="+", default=defaultGrid["rounds"], help="Round budgets. Integers. Default is 1000000.")
+    parser.add_argument("-g", "--grid", default=None, help="Read the grid from the JSON file GRID, an object with any of doors, reveals, hosts, strategies and rounds as lists. Overrides the options above.")
+    parser.add_argument("-p", "--procs", type=int, default=processLimit, help="Set the number of processes. Integer. Default is CPU Logical Cores. " + str(processLimit))
+    parser.add_argument("-s", "--seed", type=int, default=None, help="Set the master random seed. Non-negative Integer. Default is a new random seed.")
+    parser.add_argument("-b", "--blocksize", type=int, default=defaultBlockSize, help="Set the number of rounds per task and random stream block. Integer. Default is " + str(defaultBlockSize) + ".")
+    parser.add_argument("-c", "--confidence", type=float, default=defaultConfidence, help="Set the confidence level of the intervals. Float. Default is " + str(defaultConfidence) + ".")
+    parser.add_argument("-T", "--table", default=None, help="Write the table to TABLE, as CSV when it ends .csv, otherwise as JSON columns. Default is none.")
+    args = parser.parse_args()
+
+    if args.grid:
+        try:
+            with open(args.grid) as gridFile:
+                grid = json.load(gridFile)
+        except (OSError, ValueError) as e:
+            parser.error("can not read the grid, " + str(e))
+    else:
+        grid = {"doors": args.doors, "reveals": args.reveals, "hosts": args.hosts, "strategies": args.strategies, "rounds": args.rounds}
+    seed = args.seed if args.seed is not None else newSeed()
+
+    print("Monty Hall Parameter Sweep, " + str(max(args.procs, 1)) + " processes.")
+    print("Seed: " + str(seed))
+    try:
+        table = sweep(grid, seed, max(args.procs, 1), args.blocksize, args.confidence)
+    except (ValueError, ImportError) as e:
+        parser.error(str(e))
+    except KeyboardInterrupt:
+        print("Interrupted.")
+        sys.exit(130)
+
+    print("Results for " + str(len(table.rows())) + " rows.")
+    print("============================================================")
+    print("Duration, " + str(table.duration) + " seconds.")
+    print("Doors, Reveals, Host, Rounds, Strategy, Scored, Wins, Rate")
+    for row in table.rows():
+        print(", ".join(str(value) for value in row[:7]) + ", " + str(row[7] * 100) + " %")
+    if args.table:
+        table.save(args.table)
+        print("Table saved to " + args.table)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+# Monty Hall Simulator - Convergence Trace
+#######################################
+# Author: Dave Auld
+# Version: 1.0
+# Date: 18th October 2026
+# Description: Streams the running win
+# rate of each strategy, and the
+# variance of the rate, at log spaced
+# round counts (100, 1000, ...) or at a
+# fixed stride, to a CSV or JSON lines
+# file while the run plays. Workers note
+# their block's counts at any trace
+# rounds inside it, and the blocks are
+# merged in round order as they finish,
+# so the trace is the same for any
+# number of threads or processes and
+# only the blocks finished out of order
+# are held in memory.
+#
+# License: MIT
+#######################################
+
+import json                                 # used for the trace as JSON lines
+import threading                            # blocks finish on several threads at once
+
+# Strategies in the order of the counts
+strategyNames = ["stick", "random", "swap"]
+
+# Columns of a trace row
+traceColumns = ["rounds"] + [name + column for name in strategyNames for column in ["Wins", "Rate", "Variance"]]
+
+class TraceSchedule:
+    # Round counts to trace at. With a stride every stride rounds, otherwise at 100, 1000, 10000 and so on.
+    # It is passed to the pool processes, so it only holds numbers.
+
+    def __init__(self, stride=None):
+        if stride is not None and stride < 1:
+            raise ValueError("the trace stride must be at least 1")
+        self.stride = stride
+
+    def marks(self, firstRound, lastRound):
+        # Trace rounds from firstRound to lastRound, in order
+        if self.stride:
+            first = -(-firstRound // self.stride) * self.stride
+            return list(range(first, lastRound + 1, self.stride))
+        marks = []
+        mark = 100
+        while mark <= lastRound:
+            if mark >= firstRound:
+                marks.append(mark)
+            mark *= 10
+        return marks
+
+class ConvergenceTrace:
+    # Writes a trace row at each round count of schedule to path, as CSV, or as JSON lines when path
+    # ends .json or .jsonl. Engines call add() as each block finishes, with the block's counts at its
+    # trace rounds, and finish() writes a last row for the whole run.
+
+    def __init__(self, path, schedule):
+        self.schedule = schedule
+        self.json = path.endswith(".json") or path.endswith(".jsonl")
+        self.traceFile = open(path, "w")
+        if not self.json:
+            self.traceFile.write(",".join(traceColumns) + "\n")
+        self.lock = threading.Lock()        # Blocks finish on the engine threads
+        self.finished = {}                  # Blocks finished ahead of their turn, by block number
+        self.nextBlock = 0
+        self.rounds = 0
+        self.results = [0,0,0]
+        self.lastRow = 0
+
+    def marks(self, block):
+        blockNumber, firstRound, roundCount = block
+        return self.schedule.marks(firstRound, firstRound + roundCount - 1)
+
+    def add(self, block, result, snapshots):
+        # A block has finished. snapshots holds (RoundNumber, [stick, random, swap]) for each trace round in
+        # the block, the block's own counts up to that round.
+        with self.lock:
+            self.finished[block[0]] = (block, result, snapshots)
+            while self.nextBlock in self.finished:
+                block, result, snapshots = self.finished.pop(self.nextBlock)
+                for roundNumber, counts in snapshots:
+                    self.writeRow(roundNumber, [self.results[i] + counts[i] for i in range(3)])
+                self.results = [self.results[i] + result[i] for i in range(3)]
+                self.rounds += block[2]
+                self.nextBlock += 1
+
+    def writeRow(self, rounds, results):
+        # The wins of each strategy are a sum of 0/1 outcomes, so the counts are all the merged statistics
+        # need, the variance of a rate over n rounds is rate * (1 - rate) / n.
+        row = [rounds]
+        for wins in results:
+            rate = float(wins) / rounds
+            row += [wins, rate, rate * (1 - rate) / rounds]
+        if self.json:
+            self.traceFile.write(json.dumps(dict(zip(traceColumns, row))) + "\n")
+        else:
+            self.traceFile.write(",".join(str(value) for value in row) + "\n")
+        self.traceFile.flush()
+        self.lastRow = rounds
+
+    def finish(self):
+        # Write the row for all the rounds played, unless it was a trace round, and close the file
+        with self.lock:
+            if self.rounds and self.lastRow != self.rounds:
+                self.writeRow(self.rounds, self.results)
+            self.traceFile.close()
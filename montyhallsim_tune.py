@@ -0,0 +1,269 @@
+# Monty Hall Simulator - Auto Tuning
+#######################################
+# Author: Dave Auld
+# Version: 1.0
+# Date: 18th October 2026
+# Description: Picks the engine, number
+# of workers and block size that play a
+# run fastest on this machine. Only the
+# CPUs the process may actually use are
+# counted, its CPU affinity capped by
+# any cgroup CPU quota. A short
+# calibration times each engine's
+# startup, its cost per round and its
+# cost per block at 1 worker, one per
+# physical core and one per CPU, and
+# the fastest settings for the rounds
+# asked for are worked out from these.
+# The calibration is cached per machine,
+# so it only runs once.
+#
+# License: MIT
+#######################################
+
+import json                                 # used for the calibration cache
+import multiprocessing                      # used for the CPU count without an affinity mask
+import os                                   # used for the CPU affinity and the cache file
+import platform                             # used to tell the machines in the cache apart
+from math import ceil                       # used to round the CPU quota up
+from importlib.util import find_spec        # used to check for numpy and numba without importing them
+from timeit import default_timer as timer   # used for timing the calibration runs.
+from montyhallsim_core import defaultDoors, blocks
+from montyhallsim_engines import engines, engineBlockSize  # the simulation engines by name
+
+# Engines auto tuning picks from, any other engine is only tuned when it is named
+autoEngines = ["single", "multiproc", "numpy-threaded", "jit"]
+
+# Engines that play on several threads or processes
+parallelEngines = ["threaded", "multiproc", "numpy-threaded", "jit"]
+
+# Packages an engine needs, engines whose package is not installed are not picked
+enginePackages = {"numpy-threaded": "numpy", "jit": "numba"}
+
+# Seconds each timed calibration run aims for
+calibrationTime = 0.2
+
+# Smallest block size tuning picks
+minimumBlockSize = 1000
+
+# Seed of the calibration runs
+calibrationSeed = 1
+
+# Changed whenever the calibration is, so older cached calibrations are run again
+calibrationVersion = 1
+
+def cgroupQuota():
+    # CPUs allowed by the cgroup CPU quota, None when there is no quota. cgroup v2 holds "QUOTA PERIOD",
+    # or "max PERIOD" for no quota, in cpu.max, v1 holds them in two files with a quota of -1 for none.
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as quotaFile:
+            quota, period = quotaFile.read().split()[:2]
+        if quota == "max":
+            return None
+        quota, period = int(quota), int(period)
+    except (OSError, ValueError):
+        try:
+            with open("/sys/fs/cgroup/cpu/cpu.cfs_quota_us") as quotaFile:
+                quota = int(quotaFile.read())
+            with open("/sys/fs/cgroup/cpu/cpu.cfs_period_us") as periodFile:
+                period = int(periodFile.read())
+        except (OSError, ValueError):
+            return None
+    if quota <= 0 or period <= 0:
+        return None
+    return float(quota) / period
+
+def availableCpus():
+    # CPUs this process can use, those of its affinity mask, capped by the cgroup quota rounded up
+    if hasattr(os, "sched_getaffinity"):
+        cpus = len(os.sched_getaffinity(0))
+    else:
+        cpus = multiprocessing.cpu_count()
+    quota = cgroupQuota()
+    if quota is not None:
+        cpus = min(cpus, max(1, int(ceil(quota))))
+    return cpus
+
+def physicalCores():
+    # Physical cores under the CPUs of the affinity mask, None when the topology can not be read.
+    # With SMT each core runs two or more of the CPUs.
+    if not hasattr(os, "sched_getaffinity"):
+        return None
+    cores = set()
+    try:
+        for cpu in os.sched_getaffinity(0):
+            topology = "/sys/devices/system/cpu/cpu" + str(cpu) + "/topology/"
+            with open(topology + "physical_package_id") as packageFile, open(topology + "core_id") as coreFile:
+                cores.add((packageFile.read().strip(), coreFile.read().strip()))
+    except OSError:
+        return None
+    return len(cores)
+
+def workerCounts(cpus):
+    # Worker counts the parallel engines are calibrated at, 1, one per physical core and one per CPU
+    return sorted(set([1, min(physicalCores() or cpus, cpus), cpus]))
+
+def installed(engine):
+    package = enginePackages.get(engine)
+    return package is None or find_spec(package) is not None
+
+def machineKey(cpus):
+    # Key of this machine in the cache. A new quota, Python or package gives a new key, so it is calibrated again.
+    packages = [package for package in sorted(set(enginePackages.values())) if find_spec(package) is not None]
+    return "|".join([platform.node(), platform.machine(), platform.python_implementation() + " " + platform.python_version(),
+                     str(cpus) + " cpus"] + packages + ["v" + str(calibrationVersion)])
+
+def cachePath():
+    # Calibration cache, montyhallsim/tuning.json under XDG_CACHE_HOME or ~/.cache
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "montyhallsim", "tuning.json")
+
+def readCache(path):
+    # Calibrations by machine key, empty when the cache is missing or can not be read
+    try:
+        with open(path) as cacheFile:
+            cache = json.load(cacheFile)
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+def writeCache(path, cache):
+    # Written to a temporary file and moved into place, so a run reading it never sees half a file
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temporaryPath = path + "." + str(os.getpid())
+    with open(temporaryPath, "w") as cacheFile:
+        json.dump(cache, cacheFile, indent=2)
+    os.replace(temporaryPath, path)
+
+def timeRun(engine, workers, rounds, blockSize):
+    # Seconds to start an engine, play rounds of the 3 box game in blocks of blockSize, and stop it
+    startTime = timer()
+    player = engines[engine](calibrationSeed, defaultDoors, defaultDoors - 2, workers)
+    try:
+        player.playBlocks(blocks(rounds, blockSize), [0,0,0])
+    finally:
+        player.close()
+    return timer() - startTime
+
+def calibrateEngine(engine, cpus):
+    # Time an engine at each of its worker counts, returns its timings as held by Calibration. The
+    # rounds are timed in blocks of the engine's own size and of a tenth of it, and the difference
+    # between the two gives the cost of a block apart from its rounds.
+    largeBlock = engineBlockSize(engine)
+    smallBlock = max(minimumBlockSize, largeBlock // 10)
+    firstRun = timeRun(engine, 1, 1, largeBlock)    # Imports the engine's packages, and loads the compiled jit kernel
+    timing = {"load": 0.0, "workers": {}}
+    for workers in (workerCounts(cpus) if engine in parallelEngines else [1]):
+        startup = min(timeRun(engine, workers, 1, largeBlock), timeRun(engine, workers, 1, largeBlock))
+        if not timing["workers"]:
+            timing["load"] = max(firstRun - startup, 0.0)
+        # One block per worker gives the length of the timed runs
+        pilot = max(timeRun(engine, workers, workers * largeBlock, largeBlock) - startup, 1e-6)
+        largeBlocks = max(1, int(calibrationTime / pilot))     # Blocks per worker
+        rounds = workers * largeBlock * largeBlocks
+        smallBlocks = float(rounds) / smallBlock / workers
+        largeTime = max(timeRun(engine, workers, rounds, largeBlock) - startup, 0.0)
+        smallTime = max(timeRun(engine, workers, rounds, smallBlock) - startup, 0.0)
+        blockCost = max((smallTime - largeTime) / (smallBlocks - largeBlocks), 0.0) if smallBlocks > largeBlocks else 0.0
+        roundCost = max((largeTime - largeBlocks * blockCost) * workers / rounds, 1e-12)
+        timing["workers"][str(workers)] = {"startup": startup, "round": roundCost, "block": blockCost}
+    return timing
+
+def blockSizes(engine, workers, rounds):
+    # Block sizes worth trying for a run, the engine's own and smaller ones, and those that share the
+    # rounds out evenly between the workers. None is larger than the engine's own, which bounds the
+    # memory a block takes.
+    largest = engineBlockSize(engine)
+    sizes = set([largest, largest // 10, largest // 100])
+    for share in [1, 2, 4, 8]:
+        sizes.add(-(-rounds // (workers * share)))
+    return sorted([size for size in sizes if minimumBlockSize <= size <= largest], reverse=True) or [largest]
+
+class Tuning:
+    # Engine, workers and block size picked for a run, with the seconds it is expected to take and the CPUs it may use
+
+    def __init__(self, engine, workers, blockSize, expected, cpus):
+        self.engine = engine
+        self.workers = workers
+        self.blockSize = blockSize
+        self.expected = expected
+        self.cpus = cpus
+
+    def __repr__(self):
+        return ("Tuning(engine=" + repr(self.engine) + ", workers=" + str(self.workers) + ", blockSize=" + str(self.blockSize)
+                + ", expected=" + str(self.expected) + ")")
+
+class Calibration:
+    # Timings of the engines on this machine, {Engine: {"load": Seconds, "workers": {Workers: Timing}}}, with
+    # Timing {"startup": Seconds, "round": Seconds, "block": Seconds}. load is the time to import the engine's
+    # packages, startup the time to start and stop it, round the time a worker takes per round, and block the
+    # time a worker takes per block on top of its rounds. Worker counts are strings, as in the JSON cache.
+
+    def __init__(self, cpus, timings):
+        self.cpus = cpus
+        self.timings = timings
+
+    def timing(self, engine, workers):
+        # Timing of the calibrated worker count nearest to workers
+        counts = self.timings[engine]["workers"]
+        nearest = min(counts, key=lambda count: (abs(int(count) - workers), int(count)))
+        return counts[nearest]
+
+    def predict(self, engine, workers, blockSize, rounds):
+        # Seconds to play rounds. The blocks are shared out between the workers, so the run lasts as
+        # long as the worker with the most blocks takes.
+        timing = self.timing(engine, workers)
+        blockCount = -(-rounds // blockSize)
+        workerBlocks = -(-blockCount // workers)
+        return (self.timings[engine]["load"] + timing["startup"]
+                + workerBlocks * (min(blockSize, rounds) * timing["round"] + timing["block"]))
+
+    def best(self, rounds, engineNames, workers=None, blockSize=None):
+        # Tuning with the shortest predicted run, keeping workers and blockSize when they are set. Ties
+        # go to the first engine, the fewest workers and the largest blocks.
+        best = None
+        for engine in engineNames:
+            if engine not in parallelEngines:
+                counts = [1]
+            elif workers:
+                counts = [workers]
+            else:
+                counts = sorted(int(count) for count in self.timings[engine]["workers"])
+            for count in counts:
+                for size in ([blockSize] if blockSize else blockSizes(engine, count, rounds)):
+                    expected = self.predict(engine, count, size, rounds)
+                    if best is None or expected < best.expected * (1 - 1e-9):   # Rounding is not a reason to change
+                        best = Tuning(engine, count, size, expected, self.cpus)
+        return best
+
+def autoTune(rounds, engine=None, workers=None, blockSize=None, playsRounds=False, traces=False, path=None, retune=False,
+             progress=None):
+    # Tuning for a run of rounds. engine, workers and blockSize, when set, are kept and only the rest
+    # is tuned, with no engine it is picked from autoEngines. playsRounds leaves out the engines that
+    # can not output, log or keep the rounds, and traces those that can not trace. Engines not yet
+    # calibrated on this machine, or all of them with retune, are calibrated and saved to the cache at
+    # path, cachePath() by default. progress, when set, is called with each engine name before it is calibrated.
+    if engine == "distributed":
+        raise ValueError("the distributed engine can not be tuned, its workers run on other machines")
+    if engine is None:
+        engineNames = [name for name in autoEngines if installed(name)
+                       and not (playsRounds and getattr(engines[name], "countsOnly", False))
+                       and not (traces and not getattr(engines[name], "traces", False))]
+    else:
+        engineNames = [engine]
+    cpus = availableCpus()
+    path = path or cachePath()
+    cache = readCache(path)
+    key = machineKey(cpus)
+    timings = {} if retune else cache.get(key, {})
+    missing = [name for name in engineNames if name not in timings]
+    for name in missing:
+        if progress:
+            progress(name)
+        timings[name] = calibrateEngine(name, cpus)
+    if missing:
+        cache[key] = timings
+        writeCache(path, cache)
+    return Calibration(cpus, timings).best(rounds, engineNames, workers, blockSize)
@@ -0,0 +1,40 @@
+# Monty Hall Simulator - Distributed Worker
+#######################################
+# Author: Dave Auld
+# Version: 1.0
+# Date: 18th October 2026
+# Description: Worker for the
+# distributed coordinator,
+# montyhallsim_distributed.py. Connects
+# to the coordinator, plays the blocks
+# it is sent on a process pool and sends
+# back the counts of each block. Waits
+# for the next run when one finishes.
+#
+# License: MIT
+#######################################
+
+import argparse                             # argparse added to support command line parameter functionality
+import multiprocessing                      # Required to get CPU max logical cores.
+from montyhallsim_cli import parseAddress   # shared command line handling
+from montyhallsim_engines import runDistributedWorker  # the distributed worker
+
+def main():
+    processLimit = multiprocessing.cpu_count()  # Process Limit
+    parser = argparse.ArgumentParser(prog="montyhallsim_worker",
+                                    description='''Monty Hall Simulation distributed worker. Plays blocks of rounds for the coordinator,
+                                            montyhallsim_distributed.py.''')
+    parser.add_argument("coordinator", help="Address of the coordinator, HOST:PORT.")
+    parser.add_argument("-p", "--procs", type=int, default=processLimit, help="Set the number of processes. Integer. Default is CPU Logical Cores. " + str(processLimit))
+    parser.add_argument("-1", "--once", action="store_true", help="Exit after one run instead of waiting for the next.")
+    args = parser.parse_args()
+
+    address = parseAddress(parser, args.coordinator)
+    print("Monty Hall Simulator Worker, " + str(max(args.procs, 1)) + " processes, coordinator " + args.coordinator)
+    try:
+        runDistributedWorker(address, max(args.procs, 1), args.once)
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+# Monty Hall Simulator - Distributed Tests
+#######################################
+# Author: Dave Auld
+# Version: 1.0
+# Date: 18th October 2026
+# Description: Runs of the distributed
+# engine on loopback workers must count
+# the same as a single machine run with
+# the same seed, also when a worker is
+# lost part way through. Run with
+# python -m unittest.
+#
+# License: MIT
+#######################################
+
+import unittest                             # test framework from the standard library
+from collections import Counter             # used to count the times each block is played
+from montyhallsim_api import simulate
+from montyhallsim_core import blocks
+from montyhallsim_engines import DistributedEngine
+
+class DistributedTests(unittest.TestCase):
+
+    def testLoopbackMatchesSingle(self):
+        distributed = simulate(200000, seed=5, engine="distributed", address=("127.0.0.1", 0), workers=2, blockSize=10000)
+        single = simulate(200000, seed=5, engine="single", blockSize=10000)
+        self.assertEqual(distributed.results, single.results)
+
+    def testLostWorkerBlocksArePlayedAgain(self):
+        engine = DistributedEngine(5, 3, 1, workers=2)
+        played = Counter()
+        results = [0,0,0]
+
+        def blockDone(block, result):
+            played[block[0]] += 1
+            if len(played) == 1:
+                engine.localWorkers[0].kill()   # Lost with the blocks it has in hand
+
+        try:
+            engine.playBlocks(blocks(400000, 10000), results, blockDone)
+        finally:
+            engine.close()
+        self.assertIsNotNone(engine.localWorkers[0].exitcode)
+        self.assertEqual(sorted(played), list(range(40)))
+        self.assertEqual(max(played.values()), 1)
+        self.assertEqual(results, simulate(400000, seed=5, engine="single", blockSize=10000).results)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+# Monty Hall Simulator - Engine Tests
+#######################################
+# Author: Dave Auld
+# Version: 1.0
+# Date: 18th October 2026
+# Description: Engines drawing from the
+# same kind of random stream must count
+# the same for a seed and block size,
+# at any number of workers. Run with
+# python -m unittest.
+#
+# License: MIT
+#######################################
+
+import unittest                             # test framework from the standard library
+from importlib.util import find_spec        # used to skip the engines whose packages are not installed
+from montyhallsim_api import simulate
+
+class SameSeedTests(unittest.TestCase):
+
+    def assertSameCounts(self, runs):
+        # runs are (Engine, Workers), each played with the same seed and block size
+        counts = [simulate(100000, seed=7, engine=engine, workers=workers, blockSize=7000).results for engine, workers in runs]
+        for (engine, workers), results in zip(runs, counts):
+            self.assertEqual(results, counts[0], engine + " at " + str(workers) + " workers")
+
+    def testPythonStream(self):
+        self.assertSameCounts([("single", 1), ("threaded", 1), ("threaded", 3), ("multiproc", 1), ("multiproc", 3)])
+
+    @unittest.skipUnless(find_spec("numpy"), "numpy is not installed")
+    def testNumpyStream(self):
+        self.assertSameCounts([("numpy", 1), ("numpy-threaded", 1), ("numpy-threaded", 3)])
+
+    @unittest.skipUnless(find_spec("numba"), "numba is not installed")
+    def testJitStream(self):
+        self.assertSameCounts([("jit", 1), ("jit", 2), ("jit", 3)])
+
+    def testDefaultBlockSize(self):
+        # Workers do not change the block size an engine picks
+        for engine in ["threaded", "multiproc"]:
+            self.assertEqual(simulate(50000, seed=3, engine=engine, workers=1).results,
+                             simulate(50000, seed=3, engine=engine, workers=4).results)
+
+if __name__ == "__main__":
+    unittest.main()
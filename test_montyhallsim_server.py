@@ -0,0 +1,65 @@
+# Monty Hall Simulator - Server Tests
+#######################################
+# Author: Dave Auld
+# Version: 1.0
+# Date: 18th October 2026
+# Description: Jobs the simulation
+# server must refuse with an error line,
+# without dropping the connection. Run
+# with python -m unittest.
+#
+# License: MIT
+#######################################
+
+import asyncio                              # used to run the server
+import json                                 # used for the jobs and answers on the wire
+import socket                               # used to talk to the server
+import threading                            # the server runs on its own thread
+import unittest                             # test framework from the standard library
+from montyhallsim_server import SimulationServer
+
+class ServerJobTests(unittest.TestCase):
+
+    def setUp(self):
+        self.server = SimulationServer(1)
+        listening = threading.Event()
+
+        async def serve():
+            self.server.loop = asyncio.get_running_loop()
+            self.listener = await asyncio.start_server(self.server.handleConnection, "127.0.0.1", 0)
+            self.address = self.listener.sockets[0].getsockname()[:2]
+            listening.set()
+            async with self.listener:
+                try:
+                    await self.listener.serve_forever()
+                except asyncio.CancelledError:
+                    pass                    # Closed by tearDown
+
+        self.thread = threading.Thread(target=lambda: asyncio.run(serve()), daemon=True)
+        self.thread.start()
+        self.assertTrue(listening.wait(10))
+        self.connection = socket.create_connection(self.address)
+        self.answers = self.connection.makefile("rb")
+
+    def tearDown(self):
+        self.connection.close()
+        self.server.loop.call_soon_threadsafe(self.listener.close)
+        self.thread.join(10)
+        self.server.close()
+
+    def ask(self, job):
+        self.connection.sendall((json.dumps(job) + "\n").encode())
+        return json.loads(self.answers.readline())
+
+    def testAutoEngineIsRefused(self):
+        self.assertIn("auto", self.ask({"engine": "auto", "rounds": 1000})["error"])
+        # The connection carries on with the next job
+        self.assertEqual(self.ask({"rounds": 1000, "seed": 1})["rounds"], 1000)
+
+    def testWrongTypesAreRefused(self):
+        for job in [{"rounds": "10"}, {"doors": None}, {"rounds": True}, {"engine": 3}, {"engine": "distributed"}]:
+            self.assertIn("error", self.ask(job))
+        self.assertEqual(self.ask({"rounds": 1000, "seed": 1})["rounds"], 1000)
+
+if __name__ == "__main__":
+    unittest.main()